@@ -17,6 +17,9 @@ from models.ai_analyzer import AIAnalyzer, CacheManager
 # Structured logging for Loki
 from utils.logger import logger
 
+# Fast JSON serialization for API responses
+from utils.json_provider import OrjsonProvider
+
 # Centralized Prometheus metrics
 from utils.metrics import (
     ml_info,
@@ -33,6 +36,7 @@ import db as database
 load_dotenv()
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
 # =============================================================================
@@ -667,6 +671,7 @@ def detect_anomalies():
             'anomalies_detected': 0,
             'overall_status': 'error',
             'anomalies': [],
+            'anomalies_by_type': {},
             'proactive_tips': [],
             'confidence': 0.0,
             'metadata': {
@@ -0,0 +1,31 @@
+"""
+Ahead-of-time build of the anomaly detector's Numba kernels.
+
+Run once at image build time, in the Dockerfile's builder stage (needs a C
+compiler):
+    python build_aot.py
+
+Produces the anomaly_kernels extension module next to app.py, so the first
+/api/detect-anomalies request does not pay Numba's JIT compilation. Without
+it, models.anomaly_detector falls back to @njit (or NumPy) as before.
+
+numba.pycc is deprecated (pending removal since Numba 0.57), so numba is
+pinned below 0.69 in requirements.txt; 0.68 is the last release checked to
+still ship it. Before raising the pin, confirm pycc is still present or drop
+this step and rely on the njit(cache=True) fallback.
+"""
+import os
+
+from numba.pycc import CC
+
+from models.anomaly_detector import _welford_kernel
+
+cc = CC('anomaly_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Ratings reach the kernel as float64 arrays (NaN-masked slices of _ratings)
+cc.export('welford_mean_std', 'UniTuple(f8, 2)(f8[:])')(_welford_kernel)
+
+
+if __name__ == '__main__':
+    cc.compile()
@@ -95,8 +95,8 @@ def get_sessions(completed_only: bool = True) -> List[Dict]:
                     ORDER BY date DESC, time DESC
                 """)
 
-            results = cur.fetchall()
-            return [_format_session(dict(row)) for row in results]
+            # RealDictCursor rows are dicts already; format them straight off the cursor
+            return [_format_session(row) for row in cur]
     except Exception as e:
         logger.error(f"Error fetching sessions: {e}")
         return []
@@ -116,8 +116,7 @@ def get_sessions_with_notes(days: int = 30) -> List[Dict]:
                 ORDER BY created_at DESC
             """, (cutoff,))
 
-            results = cur.fetchall()
-            return [_format_session(dict(row)) for row in results]
+            return [_format_session(row) for row in cur]
     except Exception as e:
         logger.error(f"Error fetching sessions with notes: {e}")
         return []
@@ -136,8 +135,7 @@ def get_today_sessions() -> List[Dict]:
                 ORDER BY time ASC
             """, (today,))
 
-            results = cur.fetchall()
-            return [_format_session(dict(row)) for row in results]
+            return [_format_session(row) for row in cur]
     except Exception as e:
         logger.error(f"Error fetching today's sessions: {e}")
         return []
@@ -155,8 +153,7 @@ def get_sessions_by_date_range(start_date: str, end_date: str) -> List[Dict]:
                 ORDER BY date DESC, time DESC
             """, (start_date, end_date))
 
-            results = cur.fetchall()
-            return [_format_session(dict(row)) for row in results]
+            return [_format_session(row) for row in cur]
     except Exception as e:
         logger.error(f"Error fetching sessions by date range: {e}")
         return []
@@ -10,12 +10,66 @@ Anomaly Types:
 - overwork_spike: Sudden increase in work intensity
 - quality_decline: Drop in session ratings
 """
+import copy
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
-from collections import Counter, defaultdict
-from statistics import mean, stdev, median
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+import threading
+from statistics import stdev
+import numpy as np
 from utils.logger import logger
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _welford_kernel(values):
+    """Single-pass (Welford) mean and sample standard deviation."""
+    count = 0
+    mean_val = 0.0
+    m2 = 0.0
+    for x in values:
+        count += 1
+        delta = x - mean_val
+        mean_val += delta / count
+        m2 += (x - mean_val) * delta
+    if count < 2:
+        return mean_val, 0.0
+    return mean_val, (m2 / (count - 1)) ** 0.5
+
+
+def _numpy_mean_std(values):
+    """NumPy fallback for _welford_mean_std when Numba is not installed."""
+    if values.size < 2:
+        return (float(values[0]) if values.size else 0.0), 0.0
+    return float(values.mean()), float(values.std(ddof=1))
+
+
+try:
+    # Ahead-of-time build from build_aot.py: no JIT warm-up on the first request
+    from anomaly_kernels import welford_mean_std as _welford_mean_std
+except ImportError:
+    if NUMBA_AVAILABLE:
+        _welford_mean_std = njit(cache=True, nogil=True)(_welford_kernel)
+    else:
+        _welford_mean_std = _numpy_mean_std
+
+
+# Day ordinal used for sessions without a parseable date (never inside a window)
+_NO_DAY = np.iinfo(np.int32).min
+
+# Severity lookup table (mirrors SEVERITY_THRESHOLDS): |z| >= bound[i] maps to name[i + 1]
+_SEVERITY_BOUNDS = np.array([1.5, 2.0, 2.5, 3.0])
+_SEVERITY_NAMES = np.array([None, 'low', 'medium', 'high', 'critical'], dtype=object)
+
+# Shared pool for running the independent detectors concurrently on large inputs
+_DETECTOR_POOL = ThreadPoolExecutor(max_workers=6, thread_name_prefix='anomaly-detector')
+
 
 class PatternAnomalyDetector:
     """Detects unusual patterns in user behavior."""
@@ -100,12 +154,58 @@ class PatternAnomalyDetector:
         ]
     }
 
+    # detect_all() results shared across instances, keyed by session fingerprint
+    RESULT_CACHE_SIZE = 32
+    _result_cache: 'OrderedDict[tuple, dict]' = OrderedDict()
+    _result_cache_lock = threading.Lock()
+
+    # Below this many sessions the thread handoff costs more than the detectors
+    PARALLEL_MIN_SESSIONS = 5000
+
     def __init__(self, sessions: List[dict]):
         """Initialize detector with session history."""
         self.sessions = sessions
         self.today = datetime.now().date()
         self._prepare_data()
-        self._build_baseline()
+
+        # Too little history: skip array construction and baseline entirely
+        self._unique_days = len(set(
+            s.get('date') for s in self.sessions if s.get('date')
+        ))
+        self._insufficient = self._unique_days < self.MIN_DATA_DAYS
+        if self._insufficient:
+            return
+
+        self._build_arrays()
+        self._fingerprint = self._compute_fingerprint()
+
+    @cached_property
+    def baseline(self) -> Optional[dict]:
+        """Baseline statistics, built on first access (skipped on cache hits)."""
+        if self._insufficient:
+            return None
+        return self._build_baseline()
+
+    def _compute_fingerprint(self) -> tuple:
+        """Cheap content key for the session list (one pass, no parsing).
+
+        Keeps the full per-session tuple rather than its hash, so histories
+        with colliding hashes still compare unequal.
+        """
+        return (
+            self.today,
+            len(self.sessions),
+            tuple(
+                (s.get('date'), s.get('hour'), s.get('category'), s.get('normalized_rating'))
+                for s in self.sessions
+            )
+        )
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached detect_all() results."""
+        with cls._result_cache_lock:
+            cls._result_cache.clear()
 
     def _prepare_data(self):
         """Prepare and normalize session data."""
@@ -125,60 +225,105 @@ class PatternAnomalyDetector:
                 if isinstance(ts, datetime):
                     session['date'] = ts.strftime('%Y-%m-%d')
 
-            # Normalize productivity rating to 0-100 scale
-            if 'productivity_rating' in session and session['productivity_rating'] is not None:
-                rating = session['productivity_rating']
-                if rating <= 5:  # Old 1-5 scale
-                    session['normalized_rating'] = rating * 20
-                else:
-                    session['normalized_rating'] = rating
-            else:
-                session['normalized_rating'] = None
-
-    def _build_baseline(self):
+        # Normalize productivity ratings to 0-100 scale (old 1-5 scale * 20);
+        # missing ratings stay NaN in the array and None in the session dicts
+        raw_ratings = np.fromiter(
+            (np.nan if s.get('productivity_rating') is None else s['productivity_rating']
+             for s in self.sessions),
+            dtype=np.float64, count=len(self.sessions)
+        )
+        self._ratings = np.where(raw_ratings <= 5, raw_ratings * 20, raw_ratings)
+        for session, rating in zip(self.sessions, self._ratings.tolist()):
+            session['normalized_rating'] = None if rating != rating else rating
+
+    def _build_arrays(self):
+        """Build per-session day and category arrays used by the detectors."""
+        # Parse each session date once; detectors work on ordinal day numbers
+        self._day_ordinals = np.fromiter(
+            (self._session_ordinal(s) for s in self.sessions),
+            dtype=np.int32, count=len(self.sessions)
+        )
+        dated = self._day_ordinals[self._day_ordinals != _NO_DAY]
+        self._day_ids, day_inverse = np.unique(dated, return_inverse=True)
+        self._sessions_per_day = np.bincount(day_inverse, minlength=self._day_ids.size)
+
+        # Hours of day fit in int16; missing hours count as midday like the old default
+        self._hours = np.fromiter(
+            (12 if s.get('hour') is None else s['hour'] for s in self.sessions),
+            dtype=np.int16, count=len(self.sessions)
+        )
+
+        # Integer-encode categories once so distributions become np.bincount calls
+        categories = [s.get('category', 'Unknown') for s in self.sessions]
+        self._cat_vocab = sorted(set(categories), key=lambda cat: (cat is None, str(cat)))
+        cat_index = {cat: i for i, cat in enumerate(self._cat_vocab)}
+        self._cat_codes = np.fromiter(
+            (cat_index[cat] for cat in categories), dtype=np.int16, count=len(categories)
+        )
+        self._has_category = np.fromiter(
+            (bool(s.get('category')) for s in self.sessions), dtype=bool, count=len(self.sessions)
+        )
+
+    def _build_baseline(self) -> Optional[dict]:
         """Build baseline statistics from historical data."""
-        baseline_sessions = self._get_sessions_last_n_days(self.BASELINE_DAYS)
+        baseline_mask = self._last_n_days_mask(self.BASELINE_DAYS)
+        baseline_count = int(baseline_mask.sum())
 
-        if len(baseline_sessions) < 5:
-            self.baseline = None
-            return
+        if baseline_count < 5:
+            return None
+
+        ratings = self._rated(baseline_mask)
+        hours = self._hours[baseline_mask]
+        self._baseline_cat_counts = np.bincount(
+            self._cat_codes[baseline_mask], minlength=len(self._cat_vocab)
+        )
+
+        per_day = self._sessions_per_day_last_n_days(self.BASELINE_DAYS)
 
-        # Calculate baseline metrics
-        ratings = [s['normalized_rating'] for s in baseline_sessions
-                   if s.get('normalized_rating') is not None]
-        hours = [s.get('hour', 12) for s in baseline_sessions]
-        categories = [s.get('category', 'Unknown') for s in baseline_sessions]
-
-        # Sessions per day
-        session_dates = defaultdict(int)
-        for s in baseline_sessions:
-            if 'date' in s:
-                session_dates[s['date']] += 1
-
-        self.baseline = {
-            'avg_productivity': mean(ratings) if ratings else 70.0,
-            'std_productivity': stdev(ratings) if len(ratings) > 1 else 10.0,
-            'avg_sessions_per_day': mean(session_dates.values()) if session_dates else 3.0,
-            'std_sessions_per_day': stdev(session_dates.values()) if len(session_dates) > 1 else 1.0,
+        category_distribution = self._distribution_from_counts(self._baseline_cat_counts)
+
+        # Most common category; ties go to the one seen first (Counter.most_common order)
+        baseline_codes = self._cat_codes[baseline_mask]
+        top_codes = np.flatnonzero(self._baseline_cat_counts == self._baseline_cat_counts.max())
+        top_code = baseline_codes[np.isin(baseline_codes, top_codes)][0]
+
+        avg_productivity, std_productivity = _welford_mean_std(ratings)
+
+        return {
+            'avg_productivity': float(avg_productivity) if ratings.size else 70.0,
+            'std_productivity': float(std_productivity) if ratings.size > 1 else 10.0,
+            'avg_sessions_per_day': float(per_day.mean()) if per_day.size else 3.0,
+            'std_sessions_per_day': float(per_day.std(ddof=1)) if per_day.size > 1 else 1.0,
             'typical_hours': self._calculate_iqr(hours),
-            'category_distribution': self._calculate_distribution(categories),
-            'top_category': Counter(categories).most_common(1)[0][0] if categories else None,
-            'total_sessions': len(baseline_sessions),
-            'unique_days': len(session_dates)
+            'category_distribution': category_distribution,
+            'top_category': self._cat_vocab[top_code],
+            'total_sessions': baseline_count,
+            'unique_days': int(per_day.size)
         }
 
-    def _calculate_iqr(self, values: List[float]) -> dict:
+    def _calculate_iqr(self, values) -> dict:
         """Calculate IQR-based range for values."""
-        if not values:
+        values = np.asarray(values)
+        if not values.size:
             return {'q1': 8, 'q3': 18, 'min': 6, 'max': 22}
 
-        sorted_vals = sorted(values)
-        n = len(sorted_vals)
+        n = values.size
         q1_idx = n // 4
         q3_idx = (3 * n) // 4
 
-        q1 = sorted_vals[q1_idx]
-        q3 = sorted_vals[q3_idx]
+        if values.dtype.kind in 'iu' and values.min() >= 0 and values.max() < 24:
+            # Hours of day: read order statistics off the cumulative 24-bucket histogram
+            cum = np.cumsum(np.bincount(values, minlength=24))
+            q1, q3, mid_lo, mid_hi = np.searchsorted(
+                cum, (q1_idx, q3_idx, (n - 1) // 2, n // 2), side='right'
+            ).tolist()
+            median = (mid_lo + mid_hi) / 2
+        else:
+            # Partial sort is enough to place both quartile indices
+            partitioned = np.partition(values, (q1_idx, q3_idx))
+            q1 = partitioned[q1_idx].item()
+            q3 = partitioned[q3_idx].item()
+            median = float(np.median(values))
         iqr = q3 - q1
 
         return {
@@ -186,42 +331,54 @@ class PatternAnomalyDetector:
             'q3': q3,
             'min': max(0, q1 - 1.5 * iqr),
             'max': min(23, q3 + 1.5 * iqr),
-            'median': median(sorted_vals)
+            'median': median
         }
 
-    def _calculate_distribution(self, values: List[str]) -> dict:
-        """Calculate percentage distribution."""
-        if not values:
+    def _distribution_from_counts(self, counts: np.ndarray) -> dict:
+        """Convert per-category counts (indexed by category code) to shares."""
+        total = int(counts.sum())
+        if not total:
             return {}
 
-        counter = Counter(values)
-        total = sum(counter.values())
-        return {k: v / total for k, v in counter.items()}
+        return {
+            self._cat_vocab[code]: count / total
+            for code, count in enumerate(counts.tolist()) if count
+        }
+
+    @staticmethod
+    def _session_ordinal(session: dict) -> int:
+        """Ordinal day of a session, or _NO_DAY if it has no valid date."""
+        try:
+            if 'date' in session:
+                return datetime.strptime(session['date'], '%Y-%m-%d').toordinal()
+            ts = session.get('timestamp')
+            if isinstance(ts, datetime):
+                return ts.toordinal()
+        except (ValueError, TypeError):
+            pass
+        return _NO_DAY
+
+    def _cutoff_ordinal(self, n: int) -> int:
+        """Ordinal of the first day included in a last-N-days window."""
+        return (self.today - timedelta(days=n)).toordinal()
+
+    def _last_n_days_mask(self, n: int) -> np.ndarray:
+        """Boolean mask over self.sessions selecting the last N days."""
+        return self._day_ordinals >= self._cutoff_ordinal(n)
+
+    def _sessions_per_day_last_n_days(self, n: int) -> np.ndarray:
+        """Session counts for each active day in the last N days."""
+        return self._sessions_per_day[self._day_ids >= self._cutoff_ordinal(n)]
+
+    def _rated(self, mask: np.ndarray) -> np.ndarray:
+        """Normalized ratings selected by mask, skipping unrated sessions."""
+        ratings = self._ratings[mask]
+        return ratings[~np.isnan(ratings)]
 
     def _get_sessions_last_n_days(self, n: int) -> List[dict]:
         """Get sessions from last N days."""
-        cutoff = self.today - timedelta(days=n)
-        result = []
-
-        for session in self.sessions:
-            try:
-                if 'date' in session:
-                    session_date = datetime.strptime(session['date'], '%Y-%m-%d').date()
-                elif 'timestamp' in session:
-                    ts = session['timestamp']
-                    if isinstance(ts, datetime):
-                        session_date = ts.date()
-                    else:
-                        continue
-                else:
-                    continue
-
-                if session_date >= cutoff:
-                    result.append(session)
-            except (ValueError, TypeError):
-                continue
-
-        return result
+        mask = self._last_n_days_mask(n)
+        return [s for s, keep in zip(self.sessions, mask) if keep]
 
     def _calculate_z_score(self, value: float, mean_val: float, std_val: float) -> float:
         """Calculate Z-score for a value."""
@@ -231,30 +388,19 @@ class PatternAnomalyDetector:
 
     def _get_severity(self, z_score: float) -> str:
         """Get severity level from absolute Z-score."""
-        abs_z = abs(z_score)
-        if abs_z >= self.SEVERITY_THRESHOLDS['critical']:
-            return 'critical'
-        elif abs_z >= self.SEVERITY_THRESHOLDS['high']:
-            return 'high'
-        elif abs_z >= self.SEVERITY_THRESHOLDS['medium']:
-            return 'medium'
-        elif abs_z >= self.SEVERITY_THRESHOLDS['low']:
-            return 'low'
-        return None
+        return _SEVERITY_NAMES[np.searchsorted(_SEVERITY_BOUNDS, abs(z_score), side='right')]
 
     def _detect_productivity_drop(self) -> Optional[dict]:
         """Detect sudden productivity decline."""
         if not self.baseline:
             return None
 
-        recent = self._get_sessions_last_n_days(self.RECENT_DAYS)
-        recent_ratings = [s['normalized_rating'] for s in recent
-                         if s.get('normalized_rating') is not None]
+        recent_ratings = self._rated(self._last_n_days_mask(self.RECENT_DAYS))
 
-        if len(recent_ratings) < 2:
+        if recent_ratings.size < 2:
             return None
 
-        recent_avg = mean(recent_ratings)
+        recent_avg, _ = _welford_mean_std(recent_ratings)
         baseline_avg = self.baseline['avg_productivity']
         baseline_std = self.baseline['std_productivity']
 
@@ -277,7 +423,7 @@ class PatternAnomalyDetector:
                 'icon': self.ANOMALY_TYPES['productivity_drop']['icon'],
                 'evidence': {
                     'period': f'last_{self.RECENT_DAYS}_days',
-                    'data_points': [round(r, 1) for r in recent_ratings[-5:]]
+                    'data_points': [round(r, 1) for r in recent_ratings[-5:].tolist()]
                 }
             }
 
@@ -325,27 +471,22 @@ class PatternAnomalyDetector:
         if not self.baseline or not self.baseline.get('category_distribution'):
             return None
 
-        recent = self._get_sessions_last_n_days(7)
-        recent_categories = [s.get('category', 'Unknown') for s in recent if s.get('category')]
+        recent_mask = self._last_n_days_mask(7) & self._has_category
+        recent_counts = np.bincount(self._cat_codes[recent_mask], minlength=len(self._cat_vocab))
+        recent_total = int(recent_counts.sum())
 
-        if len(recent_categories) < 3:
+        if recent_total < 3:
             return None
 
-        recent_dist = self._calculate_distribution(recent_categories)
-        baseline_dist = self.baseline['category_distribution']
-
-        # Find biggest shift
-        max_shift = 0
-        shifted_category = None
-
-        for cat in set(recent_dist.keys()) | set(baseline_dist.keys()):
-            recent_pct = recent_dist.get(cat, 0)
-            baseline_pct = baseline_dist.get(cat, 0)
-            shift = abs(recent_pct - baseline_pct)
-
-            if shift > max_shift:
-                max_shift = shift
-                shifted_category = cat
+        # Share of each category (by code) in both windows, compared in one vector op
+        shifts = np.abs(
+            recent_counts / recent_total
+            - self._baseline_cat_counts / self._baseline_cat_counts.sum()
+        )
+        shift_idx = int(np.argmax(shifts))
+        max_shift = float(shifts[shift_idx])
+        shifted_category = self._cat_vocab[shift_idx]
+        recent_dist = self._distribution_from_counts(recent_counts)
 
         if max_shift > 0.30:  # 30% shift threshold
             return {
@@ -370,33 +511,23 @@ class PatternAnomalyDetector:
         if len(self.sessions) < 7:
             return None
 
-        # Build date set
-        dates = set()
-        for s in self.sessions:
-            if 'date' in s:
-                try:
-                    dates.add(datetime.strptime(s['date'], '%Y-%m-%d').date())
-                except ValueError:
-                    pass
-
-        if not dates:
+        day_ids = self._day_ids
+        if not day_ids.size:
             return None
 
-        # Find longest streak before gap
-        sorted_dates = sorted(dates)
-        current_streak = 0
+        # Gaps are positions where consecutive active days are not adjacent;
+        # the streak before each gap is the run of 1-day steps since the previous gap
+        steps = np.diff(day_ids)
+        gaps = np.flatnonzero(steps > 1)
+        streaks = np.diff(np.concatenate(([-1], gaps))) - 1
+        qualifying = np.flatnonzero((streaks >= 6) & (steps[gaps] - 1 >= 2))  # 7+ day streak, 2+ day gap
+
         max_streak_before_gap = 0
         gap_start = None
-
-        for i in range(len(sorted_dates) - 1):
-            if (sorted_dates[i + 1] - sorted_dates[i]).days == 1:
-                current_streak += 1
-            else:
-                gap_days = (sorted_dates[i + 1] - sorted_dates[i]).days - 1
-                if current_streak >= 6 and gap_days >= 2:  # 7+ day streak, 2+ day gap
-                    max_streak_before_gap = current_streak + 1
-                    gap_start = sorted_dates[i] + timedelta(days=1)
-                current_streak = 0
+        if qualifying.size:
+            last = qualifying[-1]
+            max_streak_before_gap = int(streaks[last]) + 1
+            gap_start = datetime.fromordinal(int(day_ids[gaps[last]]) + 1).date()
 
         # Check if there's a recent gap
         if max_streak_before_gap >= 7:
@@ -425,20 +556,11 @@ class PatternAnomalyDetector:
         if not self.baseline:
             return None
 
-        recent = self._get_sessions_last_n_days(self.RECENT_DAYS)
-        if not recent:
-            return None
-
-        # Count sessions per day for recent period
-        recent_dates = defaultdict(int)
-        for s in recent:
-            if 'date' in s:
-                recent_dates[s['date']] += 1
-
-        if not recent_dates:
+        recent_per_day = self._sessions_per_day_last_n_days(self.RECENT_DAYS)
+        if not recent_per_day.size:
             return None
 
-        recent_avg = mean(recent_dates.values())
+        recent_avg = float(recent_per_day.mean())
         baseline_avg = self.baseline['avg_sessions_per_day']
         baseline_std = self.baseline['std_sessions_per_day']
 
@@ -470,37 +592,33 @@ class PatternAnomalyDetector:
         if not self.baseline:
             return None
 
-        recent = self._get_sessions_last_n_days(7)
-        rated_sessions = [s for s in recent if s.get('normalized_rating') is not None]
+        rated = self._rated(self._last_n_days_mask(7))
 
-        if len(rated_sessions) < 3:
+        if rated.size < 3:
             return None
 
         baseline_avg = self.baseline['avg_productivity']
 
         # Count consecutive below-average sessions from the end
-        consecutive_below = 0
-        for s in reversed(rated_sessions):
-            if s['normalized_rating'] < baseline_avg:
-                consecutive_below += 1
-            else:
-                break
+        below = (rated < baseline_avg)[::-1]
+        consecutive_below = below.size if below.all() else int(np.argmin(below))
 
         if consecutive_below >= 3:
-            recent_ratings = [s['normalized_rating'] for s in rated_sessions[-consecutive_below:]]
+            recent_ratings = rated[-consecutive_below:]
+            avg_recent, _ = _welford_mean_std(recent_ratings)
 
             return {
                 'type': 'quality_decline',
                 'name': self.ANOMALY_TYPES['quality_decline']['name'],
                 'severity': 'medium' if consecutive_below >= 5 else 'low',
                 'consecutive_count': consecutive_below,
-                'avg_recent': round(mean(recent_ratings), 1),
+                'avg_recent': round(avg_recent, 1),
                 'baseline_avg': round(baseline_avg, 1),
                 'description': f'{consecutive_below} sessions za sebou pod prumerem',
                 'recommendation': self.RECOMMENDATIONS['quality_decline'][0],
                 'icon': self.ANOMALY_TYPES['quality_decline']['icon'],
                 'evidence': {
-                    'consecutive_ratings': [round(r, 1) for r in recent_ratings],
+                    'consecutive_ratings': [round(r, 1) for r in recent_ratings.tolist()],
                     'baseline_threshold': round(baseline_avg, 1)
                 }
             }
@@ -560,11 +678,10 @@ class PatternAnomalyDetector:
 
         # Productivity trend
         recent = self._get_sessions_last_n_days(7)
-        recent_ratings = [s['normalized_rating'] for s in recent
-                         if s.get('normalized_rating') is not None]
+        recent_ratings = self._rated(self._last_n_days_mask(7))
 
-        if len(recent_ratings) >= 3:
-            recent_avg = mean(recent_ratings)
+        if recent_ratings.size >= 3:
+            recent_avg = float(recent_ratings.mean())
             baseline_avg = self.baseline['avg_productivity']
             diff = recent_avg - baseline_avg
 
@@ -578,13 +695,10 @@ class PatternAnomalyDetector:
             productivity_trend = 'unknown'
 
         # Work intensity
-        recent_dates = defaultdict(int)
-        for s in recent:
-            if 'date' in s:
-                recent_dates[s['date']] += 1
+        recent_per_day = self._sessions_per_day_last_n_days(7)
 
-        if recent_dates:
-            recent_intensity = mean(recent_dates.values())
+        if recent_per_day.size:
+            recent_intensity = float(recent_per_day.mean())
             baseline_intensity = self.baseline['avg_sessions_per_day']
             ratio = recent_intensity / baseline_intensity if baseline_intensity > 0 else 1
 
@@ -618,66 +732,88 @@ class PatternAnomalyDetector:
 
     def _calculate_current_streak(self) -> int:
         """Calculate current streak length."""
-        dates = set()
-        for s in self.sessions:
-            if 'date' in s:
-                try:
-                    dates.add(datetime.strptime(s['date'], '%Y-%m-%d').date())
-                except ValueError:
-                    pass
+        days = set(self._day_ids.tolist())
+        today = self.today.toordinal()
 
-        if not dates or self.today not in dates:
-            # Check if yesterday has a session (streak may continue today)
-            yesterday = self.today - timedelta(days=1)
-            if yesterday not in dates:
-                return 0
+        # Streak may still continue today if yesterday was active
+        check_day = today if today in days else today - 1
 
         streak = 0
-        check_date = self.today
-
-        while check_date in dates:
+        while check_day - streak in days:
             streak += 1
-            check_date -= timedelta(days=1)
-
-        # Also check from yesterday if today not in dates
-        if self.today not in dates:
-            check_date = self.today - timedelta(days=1)
-            streak = 0
-            while check_date in dates:
-                streak += 1
-                check_date -= timedelta(days=1)
 
         return streak
 
     def detect_all(self) -> dict:
-        """Main method - detect all anomalies and return comprehensive report."""
-        # Check for sufficient data
-        unique_days = len(set(
-            s.get('date') for s in self.sessions if s.get('date')
-        ))
-
-        if unique_days < self.MIN_DATA_DAYS:
-            return {
-                'anomalies_detected': 0,
-                'overall_status': 'insufficient_data',
-                'anomalies': [],
-                'proactive_tips': [],
-                'message': f'Potrebuji alespon {self.MIN_DATA_DAYS} dni dat pro analyzu',
-                'baseline_summary': None,
-                'patterns': None,
-                'confidence': 0.0,
-                'metadata': {
-                    'model_version': '1.0',
-                    'total_sessions_analyzed': len(self.sessions),
-                    'unique_days': unique_days,
-                    'required_days': self.MIN_DATA_DAYS,
-                    'timestamp': datetime.now().isoformat()
-                }
+        """Main method - detect all anomalies and return comprehensive report.
+
+        Results are memoized per session fingerprint, so repeated requests
+        against an unchanged session history skip detection entirely. Each
+        call gets its own copy of the report with a current timestamp.
+        """
+        if self._insufficient:
+            return self._empty_response()
+
+        cache = self._result_cache
+        with self._result_cache_lock:
+            cached = cache.get(self._fingerprint)
+            if cached is not None:
+                cache.move_to_end(self._fingerprint)
+                return self._fresh_report(cached)
+
+        result = self._run_detection()
+
+        with self._result_cache_lock:
+            cache[self._fingerprint] = result
+            while len(cache) > self.RESULT_CACHE_SIZE:
+                cache.popitem(last=False)
+
+        return self._fresh_report(result)
+
+    @staticmethod
+    def _fresh_report(report: dict) -> dict:
+        """Deep copy of a cached report, stamped with the current time."""
+        fresh = copy.deepcopy(report)
+        fresh['metadata']['timestamp'] = datetime.now().isoformat()
+        return fresh
+
+    def _empty_response(self) -> dict:
+        """Report returned when there are fewer than MIN_DATA_DAYS of data."""
+        return {
+            'anomalies_detected': 0,
+            'overall_status': 'insufficient_data',
+            'anomalies': [],
+            'anomalies_by_type': {},
+            'proactive_tips': [],
+            'message': f'Potrebuji alespon {self.MIN_DATA_DAYS} dni dat pro analyzu',
+            'baseline_summary': None,
+            'patterns': None,
+            'confidence': 0.0,
+            'metadata': {
+                'model_version': '1.0',
+                'total_sessions_analyzed': len(self.sessions),
+                'unique_days': self._unique_days,
+                'required_days': self.MIN_DATA_DAYS,
+                'timestamp': datetime.now().isoformat()
             }
+        }
 
-        # Run all detections
-        anomalies = []
+    def _run_detector(self, detector) -> Optional[dict]:
+        """Run a single detector, logging (not raising) any error."""
+        try:
+            return detector()
+        except Exception as e:
+            # Log but don't fail
+            logger.warning("ANOMALY_DETECTOR_ERROR", message=f"Detection error in {detector.__name__}", error={"type": type(e).__name__, "message": str(e)}, context={"detector": detector.__name__})
+            return None
+
+    def _run_detection(self) -> dict:
+        """Run all detectors and build the report (uncached)."""
+        unique_days = self._unique_days
+        # Build the lazy baseline here, before any detector thread reads it
+        baseline = self.baseline
 
+        # Run all detections
         detectors = [
             self._detect_productivity_drop,
             self._detect_unusual_hours,
@@ -687,30 +823,34 @@ class PatternAnomalyDetector:
             self._detect_quality_decline
         ]
 
-        for detector in detectors:
-            try:
-                result = detector()
-                if result:
-                    anomalies.append(result)
-            except Exception as e:
-                # Log but don't fail
-                logger.warning("ANOMALY_DETECTOR_ERROR", message=f"Detection error in {detector.__name__}", error={"type": type(e).__name__, "message": str(e)}, context={"detector": detector.__name__})
+        if len(self.sessions) >= self.PARALLEL_MIN_SESSIONS:
+            # Detectors only read the prepared arrays, so they can run side by side
+            results = list(_DETECTOR_POOL.map(self._run_detector, detectors))
+        else:
+            results = [self._run_detector(detector) for detector in detectors]
+
+        anomalies = [result for result in results if result]
+
+        # Group once so callers can look anomalies up by type
+        anomalies_by_type = defaultdict(list)
+        for anomaly in anomalies:
+            anomalies_by_type[anomaly['type']].append(anomaly)
 
         # Calculate confidence based on data quality
         confidence = min(0.9, 0.3 + (unique_days / 30) * 0.4 + (len(self.sessions) / 100) * 0.2)
 
         # Build baseline summary for response
         baseline_summary = None
-        if self.baseline:
-            typical_hours = self.baseline.get('typical_hours', {})
+        if baseline:
+            typical_hours = baseline.get('typical_hours', {})
             baseline_summary = {
-                'avg_productivity': round(self.baseline['avg_productivity'], 1),
+                'avg_productivity': round(baseline['avg_productivity'], 1),
                 'typical_hours': {
                     'start': int(typical_hours.get('q1', 9)),
                     'end': int(typical_hours.get('q3', 18))
                 },
-                'top_category': self.baseline.get('top_category'),
-                'avg_sessions_per_day': round(self.baseline['avg_sessions_per_day'], 1),
+                'top_category': baseline.get('top_category'),
+                'avg_sessions_per_day': round(baseline['avg_sessions_per_day'], 1),
                 'current_streak': self._calculate_current_streak(),
                 'analysis_period_days': self.BASELINE_DAYS
             }
@@ -719,6 +859,7 @@ class PatternAnomalyDetector:
             'anomalies_detected': len(anomalies),
             'overall_status': self._get_overall_status(anomalies),
             'anomalies': anomalies,
+            'anomalies_by_type': dict(anomalies_by_type),
             'proactive_tips': self._generate_proactive_tips(anomalies),
             'baseline_summary': baseline_summary,
             'patterns': self._get_patterns_summary(),
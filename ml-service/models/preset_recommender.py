@@ -5,6 +5,9 @@ Preset Recommender - Recommends optimal preset based on time and historical data
 from datetime import datetime
 from collections import defaultdict
 
+# Clock used for "current time" decisions; tests patch this instead of freezing time globally
+_now = datetime.now
+
 
 class PresetRecommender:
     """Recommends the best preset based on current context"""
@@ -79,7 +82,7 @@ class PresetRecommender:
         Returns:
             dict: Recommendation with preset, reason, and confidence
         """
-        now = datetime.now()
+        now = _now()
         current_hour = now.hour
         current_minute = now.minute
 
@@ -492,13 +492,50 @@ class SessionQualityPredictor:
         Returns:
             Prediction dict with productivity, confidence, factors, recommendation
         """
+        return self._predict(hour, day, preset, category, sessions_today,
+                             minutes_since_last, wellness_data)
+
+    def predict_batch(self, contexts: List[dict]) -> List[dict]:
+        """
+        Predict several session contexts against the same history.
+
+        Each context holds predict() keyword arguments (hour, day, preset,
+        category, sessions_today, minutes_since_last, optional wellness_data).
+        Factor scores shared between contexts, e.g. the same hour or preset,
+        are computed once for the whole batch.
+
+        Returns:
+            List of prediction dicts, in the order of contexts
+        """
+        factor_cache = {}
+        return [self._predict(factor_cache=factor_cache, **context) for context in contexts]
+
+    def _factor_score(self, factor_cache: Optional[dict], calculate, *args) -> Tuple[float, float]:
+        """Run a factor calculation, reusing a batch result for the same arguments."""
+        if factor_cache is None:
+            return calculate(*args)
+        key = (calculate.__name__,) + args
+        if key not in factor_cache:
+            factor_cache[key] = calculate(*args)
+        return factor_cache[key]
+
+    def _predict(self, hour: int, day: int, preset: str, category: Optional[str],
+                 sessions_today: int, minutes_since_last: Optional[int],
+                 wellness_data: Optional[dict] = None,
+                 factor_cache: Optional[dict] = None) -> dict:
+        """Build a prediction; factor_cache shares factor scores across predict_batch()."""
         # Calculate all factor scores
-        hour_score, hour_conf = self._calculate_hour_score(hour)
-        day_score, day_conf = self._calculate_day_score(day)
-        preset_score, preset_conf = self._calculate_preset_score(preset, hour)
-        category_score, category_conf = self._calculate_category_score(category, hour)
-        fatigue_score, fatigue_conf = self._calculate_fatigue_score(sessions_today)
-        recovery_score, recovery_conf = self._calculate_recovery_score(minutes_since_last)
+        hour_score, hour_conf = self._factor_score(factor_cache, self._calculate_hour_score, hour)
+        day_score, day_conf = self._factor_score(factor_cache, self._calculate_day_score, day)
+        preset_score, preset_conf = self._factor_score(
+            factor_cache, self._calculate_preset_score, preset, hour)
+        category_score, category_conf = self._factor_score(
+            factor_cache, self._calculate_category_score, category, hour)
+        fatigue_score, fatigue_conf = self._factor_score(
+            factor_cache, self._calculate_fatigue_score, sessions_today)
+        recovery_score, recovery_conf = self._factor_score(
+            factor_cache, self._calculate_recovery_score, minutes_since_last)
+        # Wellness check-ins are per-context dicts, so they are never shared
         wellness_score, wellness_conf = self._calculate_wellness_score(wellness_data)
 
         # Build scores dict
@@ -5,6 +5,9 @@ Session Predictor - Predicts daily session count and productivity
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+# Clock used for "current time" decisions; tests patch this instead of freezing time globally
+_now = datetime.now
+
 
 class SessionPredictor:
     """Predicts session performance and provides forecasts"""
@@ -59,7 +62,7 @@ class SessionPredictor:
         Returns:
             dict: Prediction with session count and productivity
         """
-        now = datetime.now()
+        now = _now()
         today = now.date()
         current_hour = now.hour
         day_of_week = today.weekday()
@@ -100,7 +103,7 @@ class SessionPredictor:
         Returns:
             dict: Weekly prediction
         """
-        today = datetime.now().date()
+        today = _now().date()
         week_prediction = []
 
         for i in range(7):
@@ -282,7 +285,7 @@ class SessionPredictor:
         Returns:
             dict: Trend analysis
         """
-        today = datetime.now().date()
+        today = _now().date()
         cutoff = today - timedelta(days=days)
 
         recent_sessions = []
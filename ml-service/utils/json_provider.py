@@ -0,0 +1,36 @@
+"""
+orjson-backed JSON provider for the ML Service.
+Serializes API responses (including NumPy scalars/arrays) without the
+stdlib json encoder. Output matches Flask's default provider: sorted keys,
+non-string dict keys converted to strings, dates as HTTP dates.
+"""
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider using orjson for dumps/loads."""
+
+    option = (
+        orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_SORT_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize obj to a JSON string."""
+        return self._dumpb(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes."""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Build a JSON response directly from orjson bytes."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumpb(obj) + b'\n', mimetype=self.mimetype)
+
+    def _dumpb(self, obj) -> bytes:
+        return orjson.dumps(obj, default=self.default, option=self.option)
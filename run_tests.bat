@@ -24,12 +24,12 @@ REM Parse arguments
 if "%1"=="" (
     REM Run tests separately to avoid module conflicts
     echo   [1/2] Running Web App tests...
-    python -m pytest tests/web/ -v --tb=short
+    python -m pytest tests/web/ -n auto --dist=loadfile -v --tb=short
     set WEB_EXIT=!errorlevel!
 
     echo.
     echo   [2/2] Running ML Service tests...
-    python -m pytest tests/ml_service/ -v --tb=short
+    python -m pytest tests/ml_service/ -n auto --dist=loadscope -v --tb=short
     set ML_EXIT=!errorlevel!
 
     echo.
@@ -40,10 +40,10 @@ if "%1"=="" (
     )
 ) else if "%1"=="web" (
     REM Run only web tests
-    python -m pytest tests/web/ -v --tb=short
+    python -m pytest tests/web/ -n auto --dist=loadfile -v --tb=short
 ) else if "%1"=="ml" (
     REM Run only ML service tests
-    python -m pytest tests/ml_service/ -v --tb=short
+    python -m pytest tests/ml_service/ -n auto --dist=loadscope -v --tb=short
 ) else if "%1"=="cov" (
     REM Run with coverage report (separately)
     echo   Running Web tests with coverage...
@@ -6,6 +6,7 @@ import pytest
 import sys
 import os
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 from contextlib import contextmanager
 
@@ -14,6 +15,79 @@ ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 WEB_DIR = os.path.join(ROOT_DIR, 'web')
 ML_SERVICE_DIR = os.path.join(ROOT_DIR, 'ml-service')
 
+# Service whose top-level modules (app, models, ...) are currently importable
+_active_service_dir = None
+
+
+def use_service(service_dir):
+    """Make service_dir (WEB_DIR or ML_SERVICE_DIR) the one imports resolve to.
+
+    Both services have top-level 'app' and 'models' packages. On a switch, the
+    other service's directory leaves sys.path and the modules already imported
+    from it are dropped from sys.modules, so `pytest tests` can run both suites.
+    """
+    global _active_service_dir
+    if service_dir not in sys.path:
+        sys.path.insert(0, service_dir)
+    if service_dir == _active_service_dir:
+        return
+
+    other_dir = ML_SERVICE_DIR if service_dir == WEB_DIR else WEB_DIR
+    if other_dir in sys.path:
+        sys.path.remove(other_dir)
+    other_prefix = other_dir + os.sep
+    for name, module in list(sys.modules.items()):
+        if (getattr(module, '__file__', None) or '').startswith(other_prefix):
+            del sys.modules[name]
+    _active_service_dir = service_dir
+
+
+class _JsonStub:
+    """Stand-in for psycopg2.extras.Json: keeps the wrapped value as .adapted."""
+
+    def __init__(self, adapted, dumps=None):
+        self.adapted = adapted
+
+
+# psycopg2/pgvector stand-ins for sys.modules, built once and shared by
+# every fixture that imports a service without a real database driver.
+# Plain namespaces exposing only the names the services import.
+_PSYCOPG2_STUB = SimpleNamespace(
+    pool=SimpleNamespace(ThreadedConnectionPool=lambda *args, **kwargs: MagicMock()),
+    sql=SimpleNamespace(),
+    extras=SimpleNamespace(RealDictCursor=object(), Json=_JsonStub),
+)
+_PGVECTOR_STUB = SimpleNamespace(
+    psycopg2=SimpleNamespace(register_vector=lambda conn: None),
+)
+DB_DRIVER_STUBS = {
+    'psycopg2': _PSYCOPG2_STUB,
+    'psycopg2.pool': _PSYCOPG2_STUB.pool,
+    'psycopg2.sql': _PSYCOPG2_STUB.sql,
+    'psycopg2.extras': _PSYCOPG2_STUB.extras,
+    'pgvector': _PGVECTOR_STUB,
+    'pgvector.psycopg2': _PGVECTOR_STUB.psycopg2,
+}
+
+
+@contextmanager
+def db_driver_stubs():
+    """Install DB_DRIVER_STUBS in sys.modules for the duration of the block.
+
+    One sys.modules.update() in, one restore of the saved entries out,
+    instead of a MonkeyPatch undo record per module.
+    """
+    saved = {name: sys.modules.get(name) for name in DB_DRIVER_STUBS}
+    sys.modules.update(DB_DRIVER_STUBS)
+    try:
+        yield
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
 
 class MockCursor:
     """Mock PostgreSQL cursor with RealDictCursor behavior."""
@@ -220,10 +294,13 @@ def mock_pool(mock_db_data):
 
 @pytest.fixture
 def empty_db(mock_db_data):
-    """Ensure database is empty."""
-    mock_db_data['sessions'] = []
-    mock_db_data['insights'] = []
-    mock_db_data['predictions'] = []
+    """Ensure database is empty.
+
+    Clears every table in place, so pools and cursors already holding
+    this store see the reset.
+    """
+    for rows in mock_db_data.values():
+        rows.clear()
     return mock_db_data
 
 
@@ -234,37 +311,21 @@ def mock_db(mock_db_data, mock_pool, monkeypatch):
     This fixture provides a mock PostgreSQL database environment
     by patching psycopg2 and pgvector modules.
     """
-    import sys
-    from unittest.mock import MagicMock
-
-    # Ensure web directory is in path
-    if WEB_DIR not in sys.path:
-        sys.path.insert(0, WEB_DIR)
-
-    # Mock psycopg2 before importing database
-    mock_psycopg2 = MagicMock()
-    mock_psycopg2.pool.ThreadedConnectionPool = MagicMock(return_value=mock_pool)
-    monkeypatch.setitem(sys.modules, 'psycopg2', mock_psycopg2)
-    monkeypatch.setitem(sys.modules, 'psycopg2.pool', mock_psycopg2.pool)
-    monkeypatch.setitem(sys.modules, 'psycopg2.sql', MagicMock())
-    monkeypatch.setitem(sys.modules, 'psycopg2.extras', MagicMock())
-
-    # Mock pgvector
-    mock_pgvector = MagicMock()
-    mock_pgvector.psycopg2.register_vector = MagicMock()
-    monkeypatch.setitem(sys.modules, 'pgvector', mock_pgvector)
-    monkeypatch.setitem(sys.modules, 'pgvector.psycopg2', mock_pgvector.psycopg2)
-
-    # Import and patch database module
-    import models.database as db_module
-    monkeypatch.setattr(db_module, '_pool', mock_pool)
-    monkeypatch.setattr(db_module, 'get_pool', lambda: mock_pool)
+    use_service(WEB_DIR)
 
-    return mock_db_data
+    # Mock psycopg2 and pgvector before importing database
+    with db_driver_stubs():
+        monkeypatch.setattr(_PSYCOPG2_STUB.pool, 'ThreadedConnectionPool', lambda *args, **kwargs: mock_pool)
 
+        # Import and patch database module
+        import models.database as db_module
+        monkeypatch.setattr(db_module, '_pool', mock_pool)
+        monkeypatch.setattr(db_module, 'get_pool', lambda: mock_pool)
 
-@pytest.fixture
-def sample_sessions_data():
+        yield mock_db_data
+
+
+def build_sample_sessions_data():
     """
     Sample session data covering various scenarios:
     - All days of week (Monday-Sunday)
@@ -566,6 +627,22 @@ def sample_sessions_data():
     return sessions
 
 
+@pytest.fixture(scope="session")
+def sample_sessions_snapshot():
+    """Sample sessions built once per run; never hand these rows to a test."""
+    return tuple(build_sample_sessions_data())
+
+
+@pytest.fixture
+def sample_sessions_data(sample_sessions_snapshot):
+    """Fresh copy of the sample sessions (see build_sample_sessions_data).
+
+    Rows are copied per test because MockCursor and the app mutate them
+    (e.g. assigning ids, appending logged sessions).
+    """
+    return [dict(session) for session in sample_sessions_snapshot]
+
+
 @pytest.fixture
 def sample_sessions(mock_db, sample_sessions_data):
     """Populate mock database with sample sessions."""
@@ -4,59 +4,85 @@ Provides Flask app and test client with mocked PostgreSQL.
 """
 import pytest
 import sys
-import os
-from unittest.mock import MagicMock, patch
 
-# Get absolute path and add to sys.path for imports
-ML_SERVICE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'ml-service')
-ML_SERVICE_DIR = os.path.abspath(ML_SERVICE_DIR)
-
-# Ensure ml-service directory is first in path for these tests
-if ML_SERVICE_DIR not in sys.path:
-    sys.path.insert(0, ML_SERVICE_DIR)
+# Absolute service paths, resolved once in the root conftest
+from tests.conftest import ML_SERVICE_DIR, db_driver_stubs, use_service, build_sample_sessions_data
 
 
 def _add_ml_to_path():
-    """Helper to ensure ml-service directory is in path."""
+    """Helper to make the ML service's modules the importable ones."""
+    use_service(ML_SERVICE_DIR)
+
+
+def pytest_configure(config):
+    """Ensure ml-service directory is first in path for these tests."""
     if ML_SERVICE_DIR not in sys.path:
         sys.path.insert(0, ML_SERVICE_DIR)
-    # Remove web if present to avoid conflicts
-    web_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'web'))
-    if web_dir in sys.path:
-        sys.path.remove(web_dir)
 
 
-@pytest.fixture
-def ml_app(mock_db_data, monkeypatch):
-    """Create ML Flask app with mocked PostgreSQL."""
+@pytest.fixture(scope="module")
+def ml_app():
+    """Create ML Flask app with mocked PostgreSQL (shared per test module)."""
     _add_ml_to_path()
 
-    # Mock psycopg2 imports
-    mock_psycopg2 = MagicMock()
-    monkeypatch.setitem(sys.modules, 'psycopg2', mock_psycopg2)
-    monkeypatch.setitem(sys.modules, 'psycopg2.pool', mock_psycopg2.pool)
-    monkeypatch.setitem(sys.modules, 'psycopg2.sql', MagicMock())
-    monkeypatch.setitem(sys.modules, 'psycopg2.extras', MagicMock())
-
-    # Mock pgvector
-    mock_pgvector = MagicMock()
-    monkeypatch.setitem(sys.modules, 'pgvector', mock_pgvector)
-    monkeypatch.setitem(sys.modules, 'pgvector.psycopg2', mock_pgvector.psycopg2)
+    with db_driver_stubs():
+        # Mock psycopg2 and pgvector imports
 
-    # Import app after patching
-    import app as ml_app_module
+        # Import app after patching
+        import app as ml_app_module
 
-    ml_app_module.app.config['TESTING'] = True
+        ml_app_module.app.config['TESTING'] = True
 
-    return ml_app_module.app
+        yield ml_app_module.app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def ml_client(ml_app):
     """Create test client for ML service."""
     return ml_app.test_client()
 
 
+@pytest.fixture(scope="module", autouse=True)
+def warm_anomaly_kernels():
+    """Switch imports to the ML service and warm the Welford kernel.
+
+    With Numba installed (and no AOT anomaly_kernels build) the first call
+    JIT-compiles, or loads the on-disk njit(cache=True) entry. Doing it here
+    keeps that cost out of whichever test happens to run first; later ML
+    modules hit the already-compiled kernel. Module scope keeps the ML
+    'models' package out of the web tests in a combined `pytest tests` run.
+    """
+    import numpy as np
+
+    _add_ml_to_path()
+    from models.anomaly_detector import _welford_mean_std
+
+    _welford_mean_std(np.array([1.0, 2.0]))
+
+
+@pytest.fixture(autouse=True)
+def frozen_now(request, monkeypatch):
+    """Freeze the ML models' clock for tests marked with @pytest.mark.freeze_time.
+
+    Patches only the module-level _now used by the recommender and predictor,
+    so the rest of the process keeps the real datetime.
+    """
+    marker = request.node.get_closest_marker('freeze_time')
+    if marker is None:
+        return None
+
+    from datetime import datetime
+
+    _add_ml_to_path()
+    from models import preset_recommender, session_predictor
+
+    frozen = datetime.fromisoformat(marker.args[0])
+    for module in (preset_recommender, session_predictor):
+        monkeypatch.setattr(module, '_now', lambda: frozen)
+
+    return frozen
+
+
 @pytest.fixture
 def analyzer(sample_sessions_data):
     """Create ProductivityAnalyzer with sample data (list of sessions)."""
@@ -65,20 +91,20 @@ def analyzer(sample_sessions_data):
     return ProductivityAnalyzer(sample_sessions_data)
 
 
-@pytest.fixture
-def recommender(sample_sessions_data):
-    """Create PresetRecommender with sample data (list of sessions)."""
+@pytest.fixture(scope="module")
+def recommender():
+    """Create PresetRecommender with sample data (shared per test module)."""
     _add_ml_to_path()
     from models.preset_recommender import PresetRecommender
-    return PresetRecommender(sample_sessions_data)
+    return PresetRecommender(build_sample_sessions_data())
 
 
-@pytest.fixture
-def predictor(sample_sessions_data):
-    """Create SessionPredictor with sample data (list of sessions)."""
+@pytest.fixture(scope="module")
+def predictor():
+    """Create SessionPredictor with sample data (shared per test module)."""
     _add_ml_to_path()
     from models.session_predictor import SessionPredictor
-    return SessionPredictor(sample_sessions_data)
+    return SessionPredictor(build_sample_sessions_data())
 
 
 @pytest.fixture
@@ -89,7 +115,7 @@ def empty_analyzer():
     return ProductivityAnalyzer([])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def empty_recommender():
     """Create PresetRecommender with empty session list."""
     _add_ml_to_path()
@@ -97,7 +123,7 @@ def empty_recommender():
     return PresetRecommender([])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def empty_predictor():
     """Create SessionPredictor with empty session list."""
     _add_ml_to_path()
@@ -105,23 +131,35 @@ def empty_predictor():
     return SessionPredictor([])
 
 
-@pytest.fixture
-def burnout_predictor(sample_sessions_data):
-    """Create BurnoutPredictor with sample data."""
+@pytest.fixture(scope="module")
+def predict_today_result(predictor):
+    """predict_today() result for sample data (real clock, not for freeze_time tests)."""
+    return predictor.predict_today()
+
+
+@pytest.fixture(scope="module")
+def predict_week_result(predictor):
+    """predict_week() result for sample data."""
+    return predictor.predict_week()
+
+
+@pytest.fixture(scope="module")
+def burnout_predictor():
+    """Create BurnoutPredictor with sample data (shared per test module)."""
     _add_ml_to_path()
     from models.burnout_predictor import BurnoutPredictor
-    return BurnoutPredictor(sample_sessions_data)
+    return BurnoutPredictor(build_sample_sessions_data())
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def empty_burnout_predictor():
-    """Create BurnoutPredictor with empty session list."""
+    """Create BurnoutPredictor with empty session list (shared per test module)."""
     _add_ml_to_path()
     from models.burnout_predictor import BurnoutPredictor
     return BurnoutPredictor([])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def high_risk_sessions():
     """Create sessions that simulate high burnout risk."""
     from datetime import datetime, timedelta
@@ -153,15 +191,15 @@ def high_risk_sessions():
     return sessions
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def high_risk_burnout_predictor(high_risk_sessions):
-    """Create BurnoutPredictor with high-risk session patterns."""
+    """Create BurnoutPredictor with high-risk session patterns (shared per test module)."""
     _add_ml_to_path()
     from models.burnout_predictor import BurnoutPredictor
     return BurnoutPredictor(high_risk_sessions)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def low_risk_sessions():
     """Create sessions that simulate low burnout risk (healthy patterns)."""
     from datetime import datetime, timedelta
@@ -195,33 +233,65 @@ def low_risk_sessions():
     return sessions
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def low_risk_burnout_predictor(low_risk_sessions):
-    """Create BurnoutPredictor with low-risk (healthy) session patterns."""
+    """Create BurnoutPredictor with low-risk (healthy) session patterns (shared per test module)."""
     _add_ml_to_path()
     from models.burnout_predictor import BurnoutPredictor
     return BurnoutPredictor(low_risk_sessions)
 
 
+# predict_burnout() results, computed once per module; tests must treat them as read-only
+
+@pytest.fixture(scope="module")
+def burnout_result(burnout_predictor):
+    """predict_burnout() result for sample data."""
+    return burnout_predictor.predict_burnout()
+
+
+@pytest.fixture(scope="module")
+def empty_burnout_result(empty_burnout_predictor):
+    """predict_burnout() result for an empty session list."""
+    return empty_burnout_predictor.predict_burnout()
+
+
+@pytest.fixture(scope="module")
+def high_risk_burnout_result(high_risk_burnout_predictor):
+    """predict_burnout() result for high-risk session patterns."""
+    return high_risk_burnout_predictor.predict_burnout()
+
+
+@pytest.fixture(scope="module")
+def high_risk_factors_by_name(high_risk_burnout_result):
+    """High-risk risk_factors indexed by their 'factor' key."""
+    return {f['factor']: f for f in high_risk_burnout_result['risk_factors']}
+
+
+@pytest.fixture(scope="module")
+def low_risk_burnout_result(low_risk_burnout_predictor):
+    """predict_burnout() result for low-risk session patterns."""
+    return low_risk_burnout_predictor.predict_burnout()
+
+
 # === Focus Optimizer Fixtures ===
 
-@pytest.fixture
-def focus_optimizer(sample_sessions_data):
-    """Create FocusOptimizer with sample data."""
+@pytest.fixture(scope="module")
+def focus_optimizer():
+    """Create FocusOptimizer with sample data (shared per test module)."""
     _add_ml_to_path()
     from models.focus_optimizer import FocusOptimizer
-    return FocusOptimizer(sample_sessions_data)
+    return FocusOptimizer(build_sample_sessions_data())
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def empty_focus_optimizer():
-    """Create FocusOptimizer with empty session list."""
+    """Create FocusOptimizer with empty session list (shared per test module)."""
     _add_ml_to_path()
     from models.focus_optimizer import FocusOptimizer
     return FocusOptimizer([])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def varied_hours_sessions():
     """Create sessions with varied hours to test time patterns."""
     from datetime import datetime, timedelta
@@ -276,25 +346,57 @@ def varied_hours_sessions():
     return sessions
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def varied_hours_focus_optimizer(varied_hours_sessions):
-    """Create FocusOptimizer with varied hours pattern data."""
+    """Create FocusOptimizer with varied hours pattern data (shared per test module)."""
     _add_ml_to_path()
     from models.focus_optimizer import FocusOptimizer
     return FocusOptimizer(varied_hours_sessions)
 
 
+# analyze() results, computed once per module; tests must treat them as read-only
+
+@pytest.fixture(scope="module")
+def focus_result(focus_optimizer):
+    """analyze() result for sample data (today, default session count)."""
+    return focus_optimizer.analyze()
+
+
+@pytest.fixture(scope="module")
+def focus_schedule_result(focus_optimizer):
+    """analyze(num_sessions=4) result for sample data."""
+    return focus_optimizer.analyze(num_sessions=4)
+
+
+@pytest.fixture(scope="module")
+def empty_focus_result(empty_focus_optimizer):
+    """analyze() result for an empty session list."""
+    return empty_focus_optimizer.analyze()
+
+
+@pytest.fixture(scope="module")
+def varied_hours_focus_result(varied_hours_focus_optimizer):
+    """analyze() result for varied hours pattern data."""
+    return varied_hours_focus_optimizer.analyze()
+
+
 # === Session Quality Predictor Fixtures ===
 
-@pytest.fixture
-def quality_predictor(sample_sessions_data):
-    """Create SessionQualityPredictor with sample data."""
+@pytest.fixture(scope="module")
+def quality_predictor():
+    """Create SessionQualityPredictor with sample data (shared per test module)."""
     _add_ml_to_path()
     from models.quality_predictor import SessionQualityPredictor
-    return SessionQualityPredictor(sample_sessions_data)
+    return SessionQualityPredictor(build_sample_sessions_data())
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def quality_result(quality_predictor):
+    """predict(10, 1, 'deep_work', 'Coding', 2, 20) result for sample data."""
+    return quality_predictor.predict(10, 1, 'deep_work', 'Coding', 2, 20)
+
+
+@pytest.fixture(scope="module")
 def empty_quality_predictor():
     """Create SessionQualityPredictor with empty session list."""
     _add_ml_to_path()
@@ -302,7 +404,7 @@ def empty_quality_predictor():
     return SessionQualityPredictor([])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def fatigued_sessions():
     """Create sessions simulating fatigue pattern (many sessions in one day)."""
     from datetime import datetime
@@ -328,7 +430,7 @@ def fatigued_sessions():
     return sessions
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def fatigued_quality_predictor(fatigued_sessions):
     """Create SessionQualityPredictor with fatigued session pattern."""
     _add_ml_to_path()
@@ -336,7 +438,7 @@ def fatigued_quality_predictor(fatigued_sessions):
     return SessionQualityPredictor(fatigued_sessions)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def hourly_pattern_sessions():
     """Create sessions with clear hourly productivity patterns."""
     from datetime import datetime, timedelta
@@ -391,7 +493,7 @@ def hourly_pattern_sessions():
     return sessions
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def hourly_quality_predictor(hourly_pattern_sessions):
     """Create SessionQualityPredictor with clear hourly patterns."""
     _add_ml_to_path()
@@ -446,7 +548,7 @@ def short_history_anomaly_detector(short_history_sessions):
     return PatternAnomalyDetector(short_history_sessions)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def normal_pattern_sessions():
     """Create sessions with normal, stable patterns over 14 days."""
     from datetime import datetime, timedelta
@@ -480,7 +582,7 @@ def normal_pattern_sessions():
     return sessions
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def anomaly_detector(normal_pattern_sessions):
     """Create PatternAnomalyDetector with normal stable patterns."""
     _add_ml_to_path()
@@ -488,7 +590,7 @@ def anomaly_detector(normal_pattern_sessions):
     return PatternAnomalyDetector(normal_pattern_sessions)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def declining_productivity_sessions():
     """Create sessions with declining productivity in recent days."""
     from datetime import datetime, timedelta
@@ -535,7 +637,7 @@ def declining_productivity_sessions():
     return sessions
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def declining_productivity_detector(declining_productivity_sessions):
     """Create PatternAnomalyDetector with declining productivity pattern."""
     _add_ml_to_path()
@@ -543,7 +645,7 @@ def declining_productivity_detector(declining_productivity_sessions):
     return PatternAnomalyDetector(declining_productivity_sessions)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def stable_productivity_sessions():
     """Create sessions with very stable productivity."""
     from datetime import datetime, timedelta
@@ -571,7 +673,7 @@ def stable_productivity_sessions():
     return sessions
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def stable_productivity_detector(stable_productivity_sessions):
     """Create PatternAnomalyDetector with stable productivity."""
     _add_ml_to_path()
@@ -920,29 +1022,33 @@ def single_category_detector(single_category_sessions):
 
 # === API Test Fixtures (mock database module functions) ===
 
-@pytest.fixture
-def mock_db(monkeypatch, sample_sessions_data):
-    """Mock database functions for ML service API tests.
+@pytest.fixture(scope="module")
+def mock_db(ml_app):
+    """Mock database functions for ML service API tests (shared per test module).
 
     Patches app.get_sessions() and app.db_connected to provide test data.
     This replaces the old MongoDB-style mock that tried to set app.db.
     """
-    _add_ml_to_path()
-    import app as ml_app
+    import app as ml_app_module
 
-    monkeypatch.setattr(ml_app, 'db_connected', True)
-    monkeypatch.setattr(ml_app, 'get_sessions', lambda: sample_sessions_data)
+    sessions = build_sample_sessions_data()
 
-    return sample_sessions_data
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ml_app_module, 'db_connected', True)
+        mp.setattr(ml_app_module, 'get_sessions', lambda: sessions)
+        yield sessions
 
 
 @pytest.fixture
-def mock_db_empty(monkeypatch):
-    """Mock database to return empty results."""
-    _add_ml_to_path()
-    import app as ml_app
+def mock_db_empty(ml_app, monkeypatch):
+    """Mock database to return empty results.
+
+    Function-scoped so the empty patch is undone before the next test,
+    even in modules that also use the shared mock_db fixture.
+    """
+    import app as ml_app_module
 
-    monkeypatch.setattr(ml_app, 'db_connected', True)
-    monkeypatch.setattr(ml_app, 'get_sessions', lambda: [])
+    monkeypatch.setattr(ml_app_module, 'db_connected', True)
+    monkeypatch.setattr(ml_app_module, 'get_sessions', lambda: [])
 
     return []
@@ -0,0 +1,6 @@
+"""
+Constants shared by the ML Service test modules.
+"""
+
+# Preset names the ML models may return
+VALID_PRESETS = frozenset({'deep_work', 'learning', 'quick_tasks', 'flow_mode'})
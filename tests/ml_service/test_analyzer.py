@@ -5,6 +5,8 @@ Tests ML analysis functionality.
 import pytest
 from datetime import datetime
 
+from tests.ml_service.constants import VALID_PRESETS
+
 
 class TestAnalyzeEmpty:
     """Test analyzer with empty data."""
@@ -93,11 +95,8 @@ class TestProductivityByPreset:
 
         assert isinstance(by_preset, dict)
 
-        # Valid preset names
-        valid_presets = ['deep_work', 'learning', 'quick_tasks', 'flow_mode']
-
         for preset in by_preset.keys():
-            assert preset in valid_presets
+            assert preset in VALID_PRESETS
 
 
 class TestTrendDetection:
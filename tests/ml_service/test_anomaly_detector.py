@@ -3,14 +3,10 @@ Tests for PatternAnomalyDetector.
 Comprehensive tests for anomaly detection in user behavior patterns.
 """
 import pytest
-import sys
-import os
 from datetime import datetime, timedelta
 
-# Ensure ml-service is in path
-ML_SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'ml-service'))
-if ML_SERVICE_DIR not in sys.path:
-    sys.path.insert(0, ML_SERVICE_DIR)
+# Nested parts of a detect_all() report that must not be shared between calls
+CACHED_CONTAINER_FIELDS = ('anomalies', 'anomalies_by_type', 'proactive_tips', 'patterns', 'baseline_summary')
 
 
 class TestAnomalyDetectorEmpty:
@@ -23,6 +19,7 @@ class TestAnomalyDetectorEmpty:
         assert result['overall_status'] == 'insufficient_data'
         assert result['anomalies_detected'] == 0
         assert result['anomalies'] == []
+        assert result['anomalies_by_type'] == {}
         assert result['confidence'] == 0.0
 
     def test_insufficient_days(self, short_history_anomaly_detector):
@@ -32,6 +29,10 @@ class TestAnomalyDetectorEmpty:
         assert result['overall_status'] == 'insufficient_data'
         assert 'Potrebuji alespon' in result.get('message', '')
 
+    def test_insufficient_days_skips_baseline(self, short_history_anomaly_detector):
+        """Baseline should not be built when history is too short."""
+        assert short_history_anomaly_detector.baseline is None
+
 
 class TestBaselineCalculation:
     """Test baseline statistics calculation."""
@@ -57,6 +58,22 @@ class TestBaselineCalculation:
         assert 'max' in hours
         assert hours['q1'] <= hours['q3']
 
+    @pytest.mark.parametrize('hours', [
+        [9, 10, 10, 11, 14, 15, 16],
+        [6, 8, 8, 9, 12, 13, 20, 22],
+        [9.5, 10.0, 11.0, 12.0, 13.0],
+    ])
+    def test_iqr_matches_order_statistics(self, anomaly_detector, hours):
+        """Histogram and partition paths should agree with sorted order statistics."""
+        import numpy as np
+
+        result = anomaly_detector._calculate_iqr(np.array(hours))
+        ordered = sorted(hours)
+
+        assert result['q1'] == ordered[len(hours) // 4]
+        assert result['q3'] == ordered[(3 * len(hours)) // 4]
+        assert result['median'] == float(np.median(hours))
+
 
 class TestProductivityDropDetection:
     """Test productivity drop anomaly detection."""
@@ -65,7 +82,7 @@ class TestProductivityDropDetection:
         """Should detect significant productivity decline."""
         result = declining_productivity_detector.detect_all()
 
-        prod_drops = [a for a in result['anomalies'] if a['type'] == 'productivity_drop']
+        prod_drops = result['anomalies_by_type'].get('productivity_drop', [])
         assert len(prod_drops) >= 1
 
         drop = prod_drops[0]
@@ -77,7 +94,7 @@ class TestProductivityDropDetection:
         """Should not detect drop when productivity is stable."""
         result = stable_productivity_detector.detect_all()
 
-        prod_drops = [a for a in result['anomalies'] if a['type'] == 'productivity_drop']
+        prod_drops = result['anomalies_by_type'].get('productivity_drop', [])
         assert len(prod_drops) == 0
 
 
@@ -88,7 +105,7 @@ class TestUnusualHoursDetection:
         """Should detect sessions outside normal schedule."""
         result = unusual_hours_detector.detect_all()
 
-        hour_anomalies = [a for a in result['anomalies'] if a['type'] == 'unusual_hours']
+        hour_anomalies = result['anomalies_by_type'].get('unusual_hours', [])
         assert len(hour_anomalies) >= 1
 
         anomaly = hour_anomalies[0]
@@ -98,7 +115,7 @@ class TestUnusualHoursDetection:
         """Should not flag normal working hours."""
         result = anomaly_detector.detect_all()
 
-        hour_anomalies = [a for a in result['anomalies'] if a['type'] == 'unusual_hours']
+        hour_anomalies = result['anomalies_by_type'].get('unusual_hours', [])
         # May or may not have anomalies depending on data
         assert isinstance(hour_anomalies, list)
 
@@ -110,7 +127,7 @@ class TestCategoryShiftDetection:
         """Should detect change in category preferences."""
         result = category_shift_detector.detect_all()
 
-        shifts = [a for a in result['anomalies'] if a['type'] == 'category_shift']
+        shifts = result['anomalies_by_type'].get('category_shift', [])
         assert len(shifts) >= 1
 
         shift = shifts[0]
@@ -125,7 +142,7 @@ class TestStreakBreakDetection:
         """Should detect gap after long streak."""
         result = broken_streak_detector.detect_all()
 
-        breaks = [a for a in result['anomalies'] if a['type'] == 'streak_break']
+        breaks = result['anomalies_by_type'].get('streak_break', [])
         # May not detect if streak pattern doesn't match
         assert isinstance(breaks, list)
 
@@ -137,7 +154,7 @@ class TestOverworkSpikeDetection:
         """Should detect sudden increase in sessions."""
         result = overwork_detector.detect_all()
 
-        spikes = [a for a in result['anomalies'] if a['type'] == 'overwork_spike']
+        spikes = result['anomalies_by_type'].get('overwork_spike', [])
         assert len(spikes) >= 1
 
         spike = spikes[0]
@@ -151,13 +168,41 @@ class TestQualityDeclineDetection:
         """Should detect consecutive below-average sessions."""
         result = quality_decline_detector.detect_all()
 
-        declines = [a for a in result['anomalies'] if a['type'] == 'quality_decline']
+        declines = result['anomalies_by_type'].get('quality_decline', [])
         assert len(declines) >= 1
 
         decline = declines[0]
         assert decline['consecutive_count'] >= 3
 
 
+class TestWelfordStats:
+    """Test single-pass mean/std helper used by the detectors."""
+
+    def test_matches_statistics_module(self):
+        """Welford mean/std should match statistics.mean/stdev."""
+        import numpy as np
+        from statistics import mean, stdev
+        from models.anomaly_detector import _welford_mean_std, _numpy_mean_std
+
+        values = [82.0, 45.0, 75.0, 60.0, 91.0, 55.0]
+        arr = np.asarray(values, dtype=np.float64)
+
+        for func in (_welford_mean_std, _numpy_mean_std):
+            avg, std = func(arr)
+            assert avg == pytest.approx(mean(values))
+            assert std == pytest.approx(stdev(values))
+
+    def test_single_value_has_zero_std(self):
+        """A single value should yield zero standard deviation."""
+        import numpy as np
+        from models.anomaly_detector import _welford_mean_std, _numpy_mean_std
+
+        for func in (_welford_mean_std, _numpy_mean_std):
+            avg, std = func(np.asarray([70.0]))
+            assert avg == 70.0
+            assert std == 0.0
+
+
 class TestSeverityClassification:
     """Test severity level classification."""
 
@@ -173,6 +218,16 @@ class TestSeverityClassification:
         assert detector._get_severity(3.5) == 'critical'
         assert detector._get_severity(1.0) is None
 
+    def test_severity_threshold_boundaries(self):
+        """Thresholds are inclusive and sign of Z-score is ignored."""
+        from models.anomaly_detector import PatternAnomalyDetector
+
+        detector = PatternAnomalyDetector([])
+
+        assert detector._get_severity(1.5) == 'low'
+        assert detector._get_severity(-2.0) == 'medium'
+        assert detector._get_severity(3.0) == 'critical'
+
 
 class TestOverallStatus:
     """Test overall status determination."""
@@ -247,6 +302,15 @@ class TestResponseStructure:
             assert 'recommendation' in anomaly
             assert 'icon' in anomaly
 
+    def test_anomalies_grouped_by_type(self, declining_productivity_detector):
+        """anomalies_by_type should group the flat anomalies list."""
+        result = declining_productivity_detector.detect_all()
+
+        by_type = result['anomalies_by_type']
+        assert sum(len(group) for group in by_type.values()) == len(result['anomalies'])
+        for anomaly_type, group in by_type.items():
+            assert all(a['type'] == anomaly_type for a in group)
+
     def test_baseline_summary_structure(self, anomaly_detector):
         """Baseline summary should have required fields."""
         result = anomaly_detector.detect_all()
@@ -292,7 +356,7 @@ class TestEdgeCases:
         result = single_category_detector.detect_all()
 
         # Category shift should not trigger
-        shifts = [a for a in result['anomalies'] if a['type'] == 'category_shift']
+        shifts = result['anomalies_by_type'].get('category_shift', [])
         assert len(shifts) == 0
 
     def test_confidence_range(self, anomaly_detector):
@@ -323,6 +387,105 @@ class TestEdgeCases:
             assert anomaly['severity'] in valid_severities
 
 
+class TestResultCache:
+    """Test memoization of detect_all() results."""
+
+    def test_same_sessions_hit_cache(self, normal_pattern_sessions):
+        """Detectors built from identical sessions should get equal, unshared reports."""
+        from models.anomaly_detector import PatternAnomalyDetector
+
+        PatternAnomalyDetector.clear_cache()
+        first = PatternAnomalyDetector([dict(s) for s in normal_pattern_sessions]).detect_all()
+        detector = PatternAnomalyDetector([dict(s) for s in normal_pattern_sessions])
+        second = detector.detect_all()
+
+        assert 'baseline' not in vars(detector)  # Served from the cache
+        for key in CACHED_CONTAINER_FIELDS:
+            assert second[key] == first[key]
+            if first[key] is not None:
+                assert second[key] is not first[key]
+
+    def test_cache_hit_isolated_from_caller_mutation(self, normal_pattern_sessions):
+        """Mutating nested parts of a returned report should not change later hits."""
+        from models.anomaly_detector import PatternAnomalyDetector
+
+        PatternAnomalyDetector.clear_cache()
+        first = PatternAnomalyDetector([dict(s) for s in normal_pattern_sessions]).detect_all()
+        anomalies = list(first['anomalies'])
+        tips = list(first['proactive_tips'])
+        first['anomalies'].append({'type': 'INJECTED'})
+        first['proactive_tips'].append('INJECTED')
+
+        second = PatternAnomalyDetector([dict(s) for s in normal_pattern_sessions]).detect_all()
+
+        assert second['anomalies'] == anomalies
+        assert second['proactive_tips'] == tips
+
+    def test_cache_hit_returns_copy_with_fresh_timestamp(self, normal_pattern_sessions, monkeypatch):
+        """Cached reports should be copies stamped at call time, not the cached dict."""
+        from models import anomaly_detector
+        from models.anomaly_detector import PatternAnomalyDetector
+
+        PatternAnomalyDetector.clear_cache()
+        first = PatternAnomalyDetector([dict(s) for s in normal_pattern_sessions]).detect_all()
+        expected_count = first['anomalies_detected']
+        first['anomalies_detected'] = -1  # Caller mutation must not reach the cache
+
+        detector = PatternAnomalyDetector([dict(s) for s in normal_pattern_sessions])
+        # Move the clock only after the detector has fixed its 'today'
+        later = datetime(2030, 1, 1, 12, 0)
+        monkeypatch.setattr(anomaly_detector, 'datetime', type('FrozenDatetime', (datetime,), {
+            'now': classmethod(lambda cls: later)
+        }))
+        second = detector.detect_all()
+
+        assert second['anomalies_detected'] == expected_count
+        assert second['metadata']['timestamp'] == later.isoformat()
+
+    def test_cache_hit_skips_baseline(self, normal_pattern_sessions):
+        """A cached report should not trigger the lazy baseline build."""
+        from models.anomaly_detector import PatternAnomalyDetector
+
+        PatternAnomalyDetector.clear_cache()
+        PatternAnomalyDetector([dict(s) for s in normal_pattern_sessions]).detect_all()
+
+        detector = PatternAnomalyDetector([dict(s) for s in normal_pattern_sessions])
+        detector.detect_all()
+
+        assert 'baseline' not in vars(detector)
+
+    def test_changed_sessions_miss_cache(self, normal_pattern_sessions):
+        """Changing a rating should produce a fresh result."""
+        from models.anomaly_detector import PatternAnomalyDetector
+
+        PatternAnomalyDetector.clear_cache()
+        PatternAnomalyDetector([dict(s) for s in normal_pattern_sessions]).detect_all()
+
+        changed = [dict(s) for s in normal_pattern_sessions]
+        changed[0]['productivity_rating'] = 10
+        detector = PatternAnomalyDetector(changed)
+        detector.detect_all()
+
+        assert 'baseline' in vars(detector)  # Detection actually ran
+
+
+class TestParallelDetection:
+    """Test running the detectors on the shared thread pool."""
+
+    def test_parallel_matches_sequential(self, declining_productivity_sessions, monkeypatch):
+        """Thread-pool detection should return the same report, in detector order."""
+        from models.anomaly_detector import PatternAnomalyDetector
+
+        detector = PatternAnomalyDetector([dict(s) for s in declining_productivity_sessions])
+        sequential = detector._run_detection()
+
+        monkeypatch.setattr(detector, 'PARALLEL_MIN_SESSIONS', 0)
+        parallel = detector._run_detection()
+
+        assert parallel['anomalies'] == sequential['anomalies']
+        assert parallel['anomalies_by_type'] == sequential['anomalies_by_type']
+
+
 class TestDataNormalization:
     """Test data normalization and preparation."""
 
@@ -3,9 +3,10 @@ ML Service API Endpoint Tests.
 Tests all Flask API routes for ML service.
 """
 import pytest
-import json
 from datetime import datetime
 
+from tests.ml_service.constants import VALID_PRESETS
+
 
 class TestHealthEndpoint:
     """Test health check endpoint."""
@@ -15,7 +16,7 @@ class TestHealthEndpoint:
         response = ml_client.get('/api/health')
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'status' in data or 'database' in data
 
 
@@ -27,7 +28,7 @@ class TestAnalysisEndpoint:
         response = ml_client.get('/api/analysis')
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'analysis' in data
         assert data['analysis'].get('total_sessions_analyzed', 0) == 0
 
@@ -36,7 +37,7 @@ class TestAnalysisEndpoint:
         response = ml_client.get('/api/analysis')
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'analysis' in data
 
         analysis = data['analysis']
@@ -53,16 +54,16 @@ class TestRecommendationEndpoint:
         response = ml_client.get('/api/recommendation')
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'recommended_preset' in data
-        assert data['recommended_preset'] in ['deep_work', 'learning', 'quick_tasks', 'flow_mode']
+        assert data['recommended_preset'] in VALID_PRESETS
 
     def test_recommendation_with_category(self, ml_client, mock_db):
         """GET /api/recommendation?category=SOAP should consider category."""
         response = ml_client.get('/api/recommendation?category=SOAP')
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'recommended_preset' in data
         assert 'confidence' in data
 
@@ -70,7 +71,7 @@ class TestRecommendationEndpoint:
     def test_recommendation_morning(self, ml_client, mock_db):
         """Morning hours should recommend deep_work or learning."""
         response = ml_client.get('/api/recommendation')
-        data = json.loads(response.data)
+        data = response.get_json()
 
         # Morning should prefer focused work
         assert data['recommended_preset'] in ['deep_work', 'learning', 'flow_mode']
@@ -79,7 +80,7 @@ class TestRecommendationEndpoint:
     def test_recommendation_afternoon(self, ml_client, mock_db):
         """Afternoon hours may recommend lighter presets."""
         response = ml_client.get('/api/recommendation')
-        data = json.loads(response.data)
+        data = response.get_json()
 
         # Should return some preset
         assert 'recommended_preset' in data
@@ -88,7 +89,7 @@ class TestRecommendationEndpoint:
     def test_recommendation_evening(self, ml_client, mock_db):
         """Evening hours recommendation."""
         response = ml_client.get('/api/recommendation')
-        data = json.loads(response.data)
+        data = response.get_json()
 
         assert 'recommended_preset' in data
 
@@ -101,7 +102,7 @@ class TestPredictionEndpoints:
         response = ml_client.get('/api/prediction/today')
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'predicted_sessions' in data
         assert 'confidence' in data
 
@@ -110,7 +111,7 @@ class TestPredictionEndpoints:
         response = ml_client.get('/api/prediction/week')
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'predictions' in data or 'forecast' in data or isinstance(data, list)
 
 
@@ -122,7 +123,7 @@ class TestTrendsEndpoint:
         response = ml_client.get('/api/trends')
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         # Should have some trend information
         assert 'session_trend' in data or 'productivity_trend' in data or 'trend' in data
 
@@ -135,6 +136,20 @@ class TestInsightsSummary:
         response = ml_client.get('/api/insights/summary')
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         # Should have analysis, recommendation, and prediction
         assert any(key in data for key in ['analysis', 'recommendation', 'prediction', 'trends'])
+
+
+class TestJsonProvider:
+    """Test orjson-backed JSON responses."""
+
+    def test_numpy_values_serialized(self, ml_app):
+        """NumPy scalars and arrays should serialize like native types."""
+        import numpy as np
+
+        with ml_app.app_context():
+            response = ml_app.json.response({'score': np.float64(1.5), 'hours': np.arange(3), 'count': np.int64(3)})
+
+        assert response.mimetype == 'application/json'
+        assert response.get_json() == {'count': 3, 'hours': [0, 1, 2], 'score': 1.5}
@@ -3,36 +3,91 @@ CacheManager Tests.
 Tests AI response caching functionality in PostgreSQL.
 """
 import pytest
-from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
-import sys
-import os
+from datetime import datetime
+from collections import defaultdict
+from unittest.mock import patch
 
-# Add ml-service to path
-ML_SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'ml-service'))
-if ML_SERVICE_DIR not in sys.path:
-    sys.path.insert(0, ML_SERVICE_DIR)
+# Fixed timestamp for fake cache rows, so assertions never race the clock
+GENERATED_AT = datetime(2025, 12, 28, 9, 0, 0).isoformat()
 
 
-@pytest.fixture
+class FakeCacheDatabase:
+    """Plain stand-in for the db module's cache functions.
+
+    Program results via ``returns[name]`` and failures via ``raises[name]``;
+    the arguments of every call are appended to ``calls[name]`` as a dict
+    keyed by the db.py parameter names.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Restore default return values and forget recorded calls."""
+        self.returns = {
+            'get_cached': None,
+            'set_cache': None,
+            'invalidate_all_cache': 5,
+            'clear_all_cache': 8,
+            'get_cache_status': {'total_cached': 2, 'valid': 1, 'caches': []},
+        }
+        self.raises = {}
+        self.calls = defaultdict(list)
+
+    def _call(self, name, **kwargs):
+        self.calls[name].append(kwargs)
+        if name in self.raises:
+            raise self.raises[name]
+        return self.returns[name]
+
+    def get_cached(self, cache_type, cache_key=None):
+        return self._call('get_cached', cache_type=cache_type, cache_key=cache_key)
+
+    def set_cache(self, cache_type, data, cache_key=None, ttl_hours=1):
+        return self._call('set_cache', cache_type=cache_type, data=data,
+                          cache_key=cache_key, ttl_hours=ttl_hours)
+
+    def invalidate_all_cache(self):
+        return self._call('invalidate_all_cache')
+
+    def clear_all_cache(self):
+        return self._call('clear_all_cache')
+
+    def get_cache_status(self):
+        return self._call('get_cache_status')
+
+
+@pytest.fixture(scope="module")
 def mock_database():
-    """Create a mock database module."""
-    mock = MagicMock()
-    mock.get_cached = MagicMock(return_value=None)
-    mock.set_cache = MagicMock()
-    mock.invalidate_all_cache = MagicMock(return_value=5)
-    mock.clear_all_cache = MagicMock(return_value=8)
-    mock.get_cache_status = MagicMock(return_value={'total_cached': 2, 'valid': 1, 'caches': []})
-    return mock
+    """Create a fake database module for cache calls (shared per test module)."""
+    return FakeCacheDatabase()
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock_database(mock_database):
+    """Give every test a clean fake: default returns, no errors, no calls."""
+    yield
+    mock_database.reset()
+
+
+@pytest.fixture(scope="module")
+def cache_manager():
+    """Create CacheManager for read-only checks (shared per test module).
+
+    CacheManager holds no state and does not touch the database in __init__,
+    so one instance serves the duration and key tests. Tests that program
+    database return values or errors use mock_database instead.
+    """
+    from models.ai_analyzer import CacheManager
+    return CacheManager()
 
 
 @pytest.fixture
-def cache_manager(mock_database):
-    """Create CacheManager with mocked database."""
-    with patch.dict('sys.modules', {'db': mock_database}):
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            return CacheManager()
+def db_cache_manager(mock_database, monkeypatch):
+    """Create CacheManager wired to this test's mock_database."""
+    monkeypatch.setattr('models.ai_analyzer.database', mock_database)
+    from models.ai_analyzer import CacheManager
+    return CacheManager()
 
 
 class TestCacheManagerInit:
@@ -54,209 +109,149 @@ class TestCacheManagerInit:
 class TestCacheDurations:
     """Test cache duration configuration."""
 
-    def test_morning_briefing_duration(self, cache_manager):
-        """Morning briefing should cache for 4 hours."""
-        assert cache_manager.CACHE_DURATIONS.get('morning_briefing') == 4
-
-    def test_evening_review_duration(self, cache_manager):
-        """Evening review should cache for 12 hours."""
-        assert cache_manager.CACHE_DURATIONS.get('evening_review') == 12
-
-    def test_integrated_insight_duration(self, cache_manager):
-        """Integrated insight should cache for 2 hours."""
-        assert cache_manager.CACHE_DURATIONS.get('integrated_insight') == 2
-
-    def test_analyze_quality_duration(self, cache_manager):
-        """Quality analysis should cache for 30 minutes."""
-        assert cache_manager.CACHE_DURATIONS.get('analyze_quality') == 0.5
-
-    def test_learning_duration(self, cache_manager):
-        """Learning recommendations should cache for 2 hours (dynamic)."""
-        assert cache_manager.CACHE_DURATIONS.get('learning') == 2
+    @pytest.mark.parametrize('cache_type, hours', [
+        ('morning_briefing', 4),
+        ('evening_review', 12),
+        ('integrated_insight', 2),
+        ('analyze_quality', 0.5),   # 30 minutes
+        ('learning', 2),            # dynamic recommendations
+    ])
+    def test_cache_duration(self, cache_manager, cache_type, hours):
+        """Each cache type should expire after its configured number of hours."""
+        assert cache_manager.CACHE_DURATIONS.get(cache_type) == hours
 
 
 class TestGetCached:
     """Test cache retrieval functionality."""
 
-    def test_cache_hit(self, mock_database):
+    def test_cache_hit(self, mock_database, db_cache_manager):
         """Should return cached data when valid cache exists."""
         expected_data = {'analysis': 'test', 'score': 85, 'from_cache': True}
-        mock_database.get_cached.return_value = expected_data
+        mock_database.returns['get_cached'] = expected_data
 
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            result = manager.get_cached('morning_briefing')
+        result = db_cache_manager.get_cached('morning_briefing')
 
         assert result is not None
         assert result['analysis'] == 'test'
         assert result['score'] == 85
 
-    def test_cache_miss(self, mock_database):
+    def test_cache_miss(self, mock_database, db_cache_manager):
         """Should return None when no cache exists."""
-        mock_database.get_cached.return_value = None
+        mock_database.returns['get_cached'] = None
 
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            result = manager.get_cached('morning_briefing')
+        result = db_cache_manager.get_cached('morning_briefing')
 
         assert result is None
 
-    def test_cache_with_params(self, mock_database):
+    def test_cache_with_params(self, mock_database, db_cache_manager):
         """Should use cache key when params provided."""
-        mock_database.get_cached.return_value = None
+        mock_database.returns['get_cached'] = None
 
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            params = {'preset': 'deep_work', 'category': 'Coding'}
-            manager.get_cached('analyze_quality', params)
+        params = {'preset': 'deep_work', 'category': 'Coding'}
+        db_cache_manager.get_cached('analyze_quality', params)
 
         # Verify database.get_cached was called with cache_key
-        mock_database.get_cached.assert_called_once()
-        call_args = mock_database.get_cached.call_args[0]
-        assert call_args[0] == 'analyze_quality'
-        assert call_args[1] is not None  # cache_key generated
+        assert len(mock_database.calls['get_cached']) == 1
+        call = mock_database.calls['get_cached'][-1]
+        assert call['cache_type'] == 'analyze_quality'
+        assert call['cache_key'] is not None
 
 
 class TestSetCache:
     """Test cache storage functionality."""
 
-    def test_set_cache_calls_database(self, mock_database):
+    def test_set_cache_calls_database(self, mock_database, db_cache_manager):
         """Should call database.set_cache."""
         data = {'result': 'test'}
 
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            manager.set_cache('morning_briefing', data)
+        db_cache_manager.set_cache('morning_briefing', data)
 
-        mock_database.set_cache.assert_called_once()
+        assert len(mock_database.calls['set_cache']) == 1
 
-    def test_set_cache_uses_correct_ttl(self, mock_database):
+    def test_set_cache_uses_correct_ttl(self, mock_database, db_cache_manager):
         """Should set expiration based on cache type."""
         data = {'result': 'test'}
 
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            manager.set_cache('morning_briefing', data)
+        db_cache_manager.set_cache('morning_briefing', data)
 
         # Morning briefing should use 4 hours TTL
-        call_args = mock_database.set_cache.call_args[0]
-        assert call_args[3] == 4  # ttl_hours
+        assert mock_database.calls['set_cache'][-1]['ttl_hours'] == 4
 
-    def test_set_cache_with_params(self, mock_database):
+    def test_set_cache_with_params(self, mock_database, db_cache_manager):
         """Should include cache key when params provided."""
         data = {'result': 'test'}
         params = {'preset': 'deep_work'}
 
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            manager.set_cache('analyze_quality', data, params)
+        db_cache_manager.set_cache('analyze_quality', data, params)
 
-        call_args = mock_database.set_cache.call_args[0]
-        assert call_args[2] is not None  # cache_key
+        assert mock_database.calls['set_cache'][-1]['cache_key'] is not None
 
 
 class TestInvalidateAll:
     """Test cache invalidation functionality."""
 
-    def test_invalidate_all_calls_database(self, mock_database):
-        """Should call database.invalidate_all_cache."""
-        mock_database.invalidate_all_cache.return_value = 5
+    @pytest.mark.parametrize('count', [5, 10])
+    def test_invalidate_all_returns_count(self, mock_database, db_cache_manager, count):
+        """Should call database.invalidate_all_cache and return the invalidated count."""
+        mock_database.returns['invalidate_all_cache'] = count
 
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            result = manager.invalidate_all()
+        result = db_cache_manager.invalidate_all()
 
-        mock_database.invalidate_all_cache.assert_called_once()
-        assert result == 5
-
-    def test_invalidate_all_returns_count(self, mock_database):
-        """Should return number of invalidated entries."""
-        mock_database.invalidate_all_cache.return_value = 10
-
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            result = manager.invalidate_all()
-
-        assert result == 10
+        assert len(mock_database.calls['invalidate_all_cache']) == 1
+        assert result == count
 
 
 class TestClearAll:
     """Test cache clearing functionality."""
 
-    def test_clear_all_calls_database(self, mock_database):
-        """Should call database.clear_all_cache."""
-        mock_database.clear_all_cache.return_value = 8
-
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            result = manager.clear_all()
-
-        mock_database.clear_all_cache.assert_called_once()
-        assert result == 8
+    @pytest.mark.parametrize('count', [8, 15])
+    def test_clear_all_returns_count(self, mock_database, db_cache_manager, count):
+        """Should call database.clear_all_cache and return the deleted count."""
+        mock_database.returns['clear_all_cache'] = count
 
-    def test_clear_all_returns_count(self, mock_database):
-        """Should return number of deleted entries."""
-        mock_database.clear_all_cache.return_value = 15
+        result = db_cache_manager.clear_all()
 
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            result = manager.clear_all()
-
-        assert result == 15
+        assert len(mock_database.calls['clear_all_cache']) == 1
+        assert result == count
 
 
 class TestGetStatus:
     """Test cache status functionality."""
 
-    def test_get_status_returns_counts(self, mock_database):
+    def test_get_status_returns_counts(self, mock_database, db_cache_manager):
         """Should return cache statistics."""
-        mock_database.get_cache_status.return_value = {
+        mock_database.returns['get_cache_status'] = {
             'total_cached': 2,
             'valid': 1,
             'invalidated': 1,
             'caches': []
         }
 
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            result = manager.get_status()
+        result = db_cache_manager.get_status()
 
         assert result['total_cached'] == 2
         assert result['valid'] == 1
         assert 'caches' in result
 
-    def test_get_status_cache_details(self, mock_database):
+    def test_get_status_cache_details(self, mock_database, db_cache_manager):
         """Should return details for each cache."""
-        mock_database.get_cache_status.return_value = {
+        mock_database.returns['get_cache_status'] = {
             'total_cached': 1,
             'valid': 1,
             'caches': [{
                 'type': 'morning_briefing',
                 'key': 'abc123',
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': GENERATED_AT,
                 'valid': True
             }]
         }
 
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            result = manager.get_status()
+        result = db_cache_manager.get_status()
 
         assert len(result['caches']) == 1
         cache_entry = result['caches'][0]
         assert cache_entry['type'] == 'morning_briefing'
+        assert cache_entry['generated_at'] == GENERATED_AT
 
 
 class TestGenerateKey:
@@ -293,56 +288,17 @@ class TestGenerateKey:
 class TestErrorHandling:
     """Test error handling in cache operations."""
 
-    def test_get_cached_handles_error(self, mock_database):
-        """get_cached should return None on error."""
-        mock_database.get_cached.side_effect = Exception("DB error")
+    @pytest.mark.parametrize('db_function, call, expected', [
+        pytest.param('get_cached', lambda m: m.get_cached('morning_briefing'), None, id='get_cached'),
+        pytest.param('set_cache', lambda m: m.set_cache('morning_briefing', {'data': 'test'}), None, id='set_cache'),
+        pytest.param('invalidate_all_cache', lambda m: m.invalidate_all(), 0, id='invalidate_all'),
+        pytest.param('clear_all_cache', lambda m: m.clear_all(), 0, id='clear_all'),
+        pytest.param('get_cache_status', lambda m: m.get_status(), {'error': 'DB error'}, id='get_status'),
+    ])
+    def test_handles_database_error(self, mock_database, db_cache_manager, db_function, call, expected):
+        """Cache operations should swallow database errors and return a safe default."""
+        mock_database.raises[db_function] = Exception("DB error")
 
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            result = manager.get_cached('morning_briefing')
-
-        assert result is None
-
-    def test_set_cache_handles_error(self, mock_database):
-        """set_cache should not raise on error."""
-        mock_database.set_cache.side_effect = Exception("DB error")
-
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            # Should not raise
-            manager.set_cache('morning_briefing', {'data': 'test'})
-
-    def test_invalidate_all_handles_error(self, mock_database):
-        """invalidate_all should return 0 on error."""
-        mock_database.invalidate_all_cache.side_effect = Exception("DB error")
-
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            result = manager.invalidate_all()
-
-        assert result == 0
-
-    def test_clear_all_handles_error(self, mock_database):
-        """clear_all should return 0 on error."""
-        mock_database.clear_all_cache.side_effect = Exception("DB error")
-
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            result = manager.clear_all()
-
-        assert result == 0
-
-    def test_get_status_handles_error(self, mock_database):
-        """get_status should return error dict on failure."""
-        mock_database.get_cache_status.side_effect = Exception("DB error")
-
-        with patch('models.ai_analyzer.database', mock_database):
-            from models.ai_analyzer import CacheManager
-            manager = CacheManager()
-            result = manager.get_status()
+        result = call(db_cache_manager)
 
-        assert 'error' in result
+        assert result == expected
@@ -5,28 +5,33 @@ Tests ML prediction functionality.
 import pytest
 from datetime import datetime
 
+from tests.ml_service.constants import VALID_PRESETS
+
+# Trend labels get_trends() may report
+VALID_TRENDS = frozenset({'improving', 'declining', 'stable', 'insufficient_data', None})
+
 
 class TestPredictToday:
     """Test today's prediction functionality."""
 
-    def test_predict_today_structure(self, predictor):
+    def test_predict_today_structure(self, predict_today_result):
         """predict_today() should return expected structure."""
-        result = predictor.predict_today()
+        result = predict_today_result
 
         assert 'predicted_sessions' in result
         assert 'confidence' in result
         assert 'date' in result
 
-    def test_predict_today_session_count(self, predictor):
+    def test_predict_today_session_count(self, predict_today_result):
         """Predicted sessions should be reasonable."""
-        result = predictor.predict_today()
+        result = predict_today_result
 
         # Typical workday has 4-10 sessions
         assert 0 <= result['predicted_sessions'] <= 15
 
-    def test_predict_today_confidence_range(self, predictor):
+    def test_predict_today_confidence_range(self, predict_today_result):
         """Confidence should be in valid range."""
-        result = predictor.predict_today()
+        result = predict_today_result
 
         assert 0.0 <= result['confidence'] <= 1.0
 
@@ -34,9 +39,9 @@ class TestPredictToday:
 class TestPredictWeek:
     """Test weekly prediction functionality."""
 
-    def test_predict_week_returns_7_days(self, predictor):
+    def test_predict_week_returns_7_days(self, predict_week_result):
         """predict_week() should return 7-day forecast."""
-        result = predictor.predict_week()
+        result = predict_week_result
 
         # Should be a list or dict with 7 entries
         if isinstance(result, list):
@@ -47,9 +52,9 @@ class TestPredictWeek:
             elif 'forecast' in result:
                 assert len(result['forecast']) == 7
 
-    def test_predict_week_each_day_has_prediction(self, predictor):
+    def test_predict_week_each_day_has_prediction(self, predict_week_result):
         """Each day should have session prediction."""
-        result = predictor.predict_week()
+        result = predict_week_result
 
         if isinstance(result, list):
             for day in result:
@@ -107,24 +112,22 @@ class TestTrends:
         """Trend values should be valid."""
         result = predictor.get_trends()
 
-        valid_trends = ['improving', 'declining', 'stable', 'insufficient_data', None]
-
         session_trend = result.get('session_trend')
         productivity_trend = result.get('productivity_trend')
 
         if session_trend:
-            assert session_trend in valid_trends
+            assert session_trend in VALID_TRENDS
 
         if productivity_trend:
-            assert productivity_trend in valid_trends
+            assert productivity_trend in VALID_TRENDS
 
 
 class TestScheduleRecommendation:
     """Test recommended schedule generation."""
 
-    def test_predict_today_has_schedule(self, predictor):
+    def test_predict_today_has_schedule(self, predict_today_result):
         """predict_today() may include recommended schedule."""
-        result = predictor.predict_today()
+        result = predict_today_result
 
         if 'recommended_schedule' in result:
             schedule = result['recommended_schedule']
@@ -134,24 +137,23 @@ class TestScheduleRecommendation:
                 # Each slot should have hour and preset
                 assert 'hour' in slot or 'time' in slot
                 if 'preset' in slot:
-                    valid_presets = ['deep_work', 'learning', 'quick_tasks', 'flow_mode']
-                    assert slot['preset'] in valid_presets
+                    assert slot['preset'] in VALID_PRESETS
 
 
 class TestPredictorConfidence:
     """Test prediction confidence calculation."""
 
-    def test_confidence_increases_with_data(self, predictor, empty_predictor):
+    def test_confidence_increases_with_data(self, predict_today_result, empty_predictor):
         """Confidence should be higher with more historical data."""
-        result_with_data = predictor.predict_today()
+        result_with_data = predict_today_result
         result_empty = empty_predictor.predict_today()
 
         # With data should have higher or equal confidence
         assert result_with_data['confidence'] >= result_empty['confidence']
 
-    def test_confidence_caps_at_maximum(self, predictor):
+    def test_confidence_caps_at_maximum(self, predict_today_result):
         """Confidence should not exceed maximum (0.85)."""
-        result = predictor.predict_today()
+        result = predict_today_result
 
         # Confidence typically caps at 0.85
         assert result['confidence'] <= 1.0
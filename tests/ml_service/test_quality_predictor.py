@@ -3,13 +3,6 @@ Tests for SessionQualityPredictor.
 Comprehensive tests for session quality prediction before starting.
 """
 import pytest
-import sys
-import os
-
-# Ensure ml-service is in path
-ML_SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'ml-service'))
-if ML_SERVICE_DIR not in sys.path:
-    sys.path.insert(0, ML_SERVICE_DIR)
 
 
 class TestQualityPredictorEmpty:
@@ -48,9 +41,9 @@ class TestQualityPredictorEmpty:
 class TestPredictionResponseStructure:
     """Test the structure of prediction response."""
 
-    def test_contains_all_required_fields(self, quality_predictor):
+    def test_contains_all_required_fields(self, quality_result):
         """Should contain all Ollama-ready fields."""
-        result = quality_predictor.predict(10, 1, 'deep_work', 'Coding', 2, 20)
+        result = quality_result
 
         # Top-level fields
         assert 'predicted_productivity' in result
@@ -274,19 +267,17 @@ class TestConfidenceCalculation:
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
 
-    def test_hour_boundaries(self, quality_predictor):
+    @pytest.mark.parametrize('hour', [0, 12, 23])
+    def test_hour_boundaries(self, quality_predictor, hour):
         """Test hour boundary values."""
-        # Valid hours
-        for hour in [0, 12, 23]:
-            result = quality_predictor.predict(hour, 1, 'deep_work', None, 0, None)
-            assert 'predicted_productivity' in result
+        result = quality_predictor.predict(hour, 1, 'deep_work', None, 0, None)
+        assert 'predicted_productivity' in result
 
-    def test_day_boundaries(self, quality_predictor):
+    @pytest.mark.parametrize('day', [0, 3, 6])
+    def test_day_boundaries(self, quality_predictor, day):
         """Test day boundary values."""
-        # Valid days
-        for day in [0, 3, 6]:
-            result = quality_predictor.predict(10, day, 'deep_work', None, 0, None)
-            assert result['context']['day_of_week'] == day
+        result = quality_predictor.predict(10, day, 'deep_work', None, 0, None)
+        assert result['context']['day_of_week'] == day
 
     def test_high_session_count(self, quality_predictor):
         """Test with many sessions today."""
@@ -302,9 +293,9 @@ class TestEdgeCases:
         # Should indicate cold start
         assert result['factor_scores']['recovery']['score'] <= 70
 
-    def test_productivity_range(self, quality_predictor):
+    def test_productivity_range(self, quality_result):
         """Predicted productivity should always be 0-100."""
-        result = quality_predictor.predict(10, 1, 'deep_work', 'Coding', 2, 20)
+        result = quality_result
 
         assert 0 <= result['predicted_productivity'] <= 100
 
@@ -319,16 +310,19 @@ class TestWeightedCalculation:
         total = sum(SessionQualityPredictor.WEIGHTS.values())
         assert abs(total - 1.0) < 0.001
 
-    def test_all_factors_contribute(self, quality_predictor):
+    def test_all_factors_contribute(self, quality_result):
         """All factors should contribute to final score."""
-        result = quality_predictor.predict(10, 1, 'deep_work', 'Coding', 2, 20)
+        result = quality_result
 
-        # Manually calculate weighted sum
+        import numpy as np
+        from models.quality_predictor import SessionQualityPredictor
+
+        # Manually calculate weighted sum over every weighted factor
         scores = result['factor_scores']
-        calculated = sum(
-            scores[factor]['score'] * scores[factor]['weight']
-            for factor in ['hour', 'day', 'preset', 'category', 'fatigue', 'recovery']
-        )
+        factors = list(SessionQualityPredictor.WEIGHTS)
+        factor_scores = np.fromiter((scores[f]['score'] for f in factors), dtype=np.float64, count=len(factors))
+        factor_weights = np.fromiter((scores[f]['weight'] for f in factors), dtype=np.float64, count=len(factors))
+        calculated = float(factor_scores @ factor_weights)
 
         # Should be close to predicted productivity
         assert abs(calculated - result['predicted_productivity']) < 1
@@ -341,9 +335,42 @@ class TestDayNames:
         """Test all day names are correct."""
         expected = ['Pondeli', 'Utery', 'Streda', 'Ctvrtek', 'Patek', 'Sobota', 'Nedele']
 
-        for day, name in enumerate(expected):
-            result = quality_predictor.predict(10, day, 'deep_work', None, 0, None)
-            assert result['context']['day_name'] == name
+        results = quality_predictor.predict_batch([
+            {'hour': 10, 'day': day, 'preset': 'deep_work', 'category': None,
+             'sessions_today': 0, 'minutes_since_last': None}
+            for day in range(7)
+        ])
+
+        assert [r['context']['day_name'] for r in results] == expected
+
+
+class TestPredictBatch:
+    """Test batched predictions."""
+
+    def test_batch_matches_single_predictions(self, quality_predictor):
+        """predict_batch() should return the same predictions as predict()."""
+        contexts = [
+            {'hour': 10, 'day': 1, 'preset': 'deep_work', 'category': 'Coding',
+             'sessions_today': 2, 'minutes_since_last': 20},
+            {'hour': 10, 'day': 4, 'preset': 'deep_work', 'category': 'Coding',
+             'sessions_today': 2, 'minutes_since_last': 20},
+            {'hour': 15, 'day': 1, 'preset': 'learning', 'category': None,
+             'sessions_today': 0, 'minutes_since_last': None,
+             'wellness_data': {'sleep_quality': 80, 'energy_level': 70}},
+        ]
+
+        batch = quality_predictor.predict_batch(contexts)
+
+        assert len(batch) == len(contexts)
+        for context, result in zip(contexts, batch):
+            single = quality_predictor.predict(**context)
+            for key in ('predicted_productivity', 'confidence', 'context',
+                        'factor_scores', 'factors', 'recommendation'):
+                assert result[key] == single[key]
+
+    def test_empty_batch(self, quality_predictor):
+        """predict_batch() should return an empty list for no contexts."""
+        assert quality_predictor.predict_batch([]) == []
 
 
 class TestPresetInfo:
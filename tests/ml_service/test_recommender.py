@@ -5,6 +5,8 @@ Tests ML preset recommendation functionality.
 import pytest
 from datetime import datetime
 
+from tests.ml_service.constants import VALID_PRESETS
+
 
 class TestRecommendBasic:
     """Test basic recommendation functionality."""
@@ -13,8 +15,7 @@ class TestRecommendBasic:
         """recommend() should return a valid preset name."""
         result = recommender.recommend()
 
-        valid_presets = ['deep_work', 'learning', 'quick_tasks', 'flow_mode']
-        assert result['recommended_preset'] in valid_presets
+        assert result['recommended_preset'] in VALID_PRESETS
 
     def test_recommend_has_confidence(self, recommender):
         """recommend() should include confidence score."""
@@ -41,7 +42,7 @@ class TestTimeBasedRecommendation:
         result = recommender.recommend()
 
         # Morning typically recommends deep_work or learning
-        assert result['recommended_preset'] in ['deep_work', 'learning', 'flow_mode', 'quick_tasks']
+        assert result['recommended_preset'] in VALID_PRESETS
 
     @pytest.mark.freeze_time('2025-12-28 14:00:00')
     def test_recommend_afternoon_hours(self, recommender):
@@ -58,6 +59,14 @@ class TestTimeBasedRecommendation:
 
         assert 'recommended_preset' in result
 
+    @pytest.mark.freeze_time('2025-12-28 08:00:00')
+    def test_freeze_time_marker_patches_clock(self, frozen_now):
+        """freeze_time marker should pin the recommender clock."""
+        from models import preset_recommender
+
+        assert preset_recommender._now() == frozen_now
+        assert frozen_now.hour == 8
+
 
 class TestCategoryRecommendation:
     """Test category-based recommendations."""
@@ -5,74 +5,89 @@ Provides Flask app and test client with mocked PostgreSQL.
 import pytest
 import sys
 import os
-import json
+import orjson
+import responses
 from unittest.mock import MagicMock, patch
 from contextlib import contextmanager
 
-# Get absolute path and add to sys.path for imports
-WEB_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'web')
-WEB_DIR = os.path.abspath(WEB_DIR)
-
-# Ensure web directory is first in path for these tests
-if WEB_DIR not in sys.path:
-    sys.path.insert(0, WEB_DIR)
+# Absolute service paths, resolved once in the root conftest
+from tests.conftest import WEB_DIR, db_driver_stubs, use_service
+
+# Mocked ML service endpoints, with JSON bodies serialized once at import
+ML_RECOMMENDATION_URL = 'http://ml-service:5001/api/recommendation'
+ML_PREDICTION_TODAY_URL = 'http://ml-service:5001/api/prediction/today'
+
+ML_RECOMMENDATION_BODY = orjson.dumps({
+    'current_time': '10:00',
+    'recommended_preset': 'deep_work',
+    'reason': 'Morning hours are best for deep work',
+    'alternative': 'learning',
+    'confidence': 0.75
+})
+ML_PREDICTION_TODAY_BODY = orjson.dumps({
+    'date': '2025-12-28',
+    'predicted_sessions': 6,
+    'predicted_productivity': 4.0,
+    'confidence': 0.7
+})
+ML_UNAVAILABLE_BODY = orjson.dumps({'error': 'Service unavailable'})
+
+# MagicMock cursor for mock_cursor, built once (MagicMock setup is slow)
+# and reset between tests
+_DB_CURSOR = MagicMock()
+_DB_CURSOR_CONTEXT = MagicMock()
+_DB_CURSOR_CONTEXT.__enter__.return_value = _DB_CURSOR
+_DB_CURSOR_CONTEXT.__exit__.return_value = False
 
 
 def _add_web_to_path():
-    """Helper to ensure web directory is in path."""
+    """Helper to make the web service's modules the importable ones."""
+    use_service(WEB_DIR)
+
+
+def pytest_configure(config):
+    """Ensure web directory is first in path for these tests."""
     if WEB_DIR not in sys.path:
         sys.path.insert(0, WEB_DIR)
-    # Remove ml-service if present to avoid conflicts
-    ml_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'ml-service'))
-    if ml_dir in sys.path:
-        sys.path.remove(ml_dir)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def web_config():
-    """Load web app config."""
+    """Load web app config (parsed once per test run)."""
     config_path = os.path.join(WEB_DIR, 'config.json')
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(config_path, 'rb') as f:
+        return orjson.loads(f.read())
 
 
-@pytest.fixture
-def app(mock_db_data, monkeypatch):
-    """Create Flask app with mocked PostgreSQL."""
+@pytest.fixture(scope="module")
+def web_app():
+    """Import the Flask app with mocked PostgreSQL (shared per test module)."""
     _add_web_to_path()
 
-    # Create mock pool
+    with db_driver_stubs():
+        # Mock psycopg2 and pgvector imports
+
+        # Import app after patching
+        from app import app as flask_app
+
+        flask_app.config['TESTING'] = True
+        flask_app.config['WTF_CSRF_ENABLED'] = False
+
+        yield flask_app
+
+
+@pytest.fixture
+def app(web_app, mock_db_data, monkeypatch):
+    """Flask app wired to this test's mock PostgreSQL pool."""
     from tests.conftest import MockPool
     mock_pool = MockPool(mock_db_data)
 
-    # Mock psycopg2 imports before importing database module
-    mock_psycopg2 = MagicMock()
-    mock_psycopg2.pool.ThreadedConnectionPool = MagicMock(return_value=mock_pool)
-    monkeypatch.setitem(sys.modules, 'psycopg2', mock_psycopg2)
-    monkeypatch.setitem(sys.modules, 'psycopg2.pool', mock_psycopg2.pool)
-    monkeypatch.setitem(sys.modules, 'psycopg2.sql', MagicMock())
-    monkeypatch.setitem(sys.modules, 'psycopg2.extras', MagicMock())
-
-    # Mock pgvector
-    mock_pgvector = MagicMock()
-    mock_pgvector.psycopg2.register_vector = MagicMock()
-    monkeypatch.setitem(sys.modules, 'pgvector', mock_pgvector)
-    monkeypatch.setitem(sys.modules, 'pgvector.psycopg2', mock_pgvector.psycopg2)
-
-    # Now import and patch the database module
+    # Point the database module at a fresh pool, so tests never share data
     import models.database as db_module
-
-    # Patch the pool
     monkeypatch.setattr(db_module, '_pool', mock_pool)
     monkeypatch.setattr(db_module, 'get_pool', lambda: mock_pool)
 
-    # Import app after patching
-    from app import app as flask_app
-
-    flask_app.config['TESTING'] = True
-    flask_app.config['WTF_CSRF_ENABLED'] = False
-
-    return flask_app
+    return web_app
 
 
 @pytest.fixture
@@ -81,6 +96,27 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture(scope="module")
+def db_module(web_app):
+    """The web app's models.database module, imported once per test module."""
+    import models.database as database
+    return database
+
+
+@pytest.fixture
+def mock_cursor(app, db_module, monkeypatch):
+    """Route models.database.get_cursor() to a MagicMock cursor.
+
+    Program query results via mock_cursor.fetchone / fetchall and inspect
+    mock_cursor.execute calls. The cursor is built once and reset for each
+    test; configure it through child mocks, not plain attributes.
+    """
+    _DB_CURSOR.reset_mock(return_value=True, side_effect=True)
+    _DB_CURSOR_CONTEXT.reset_mock()
+    monkeypatch.setattr(db_module, 'get_cursor', lambda *args, **kwargs: _DB_CURSOR_CONTEXT)
+    return _DB_CURSOR
+
+
 @pytest.fixture
 def app_context(app):
     """Create application context."""
@@ -88,56 +124,34 @@ def app_context(app):
         yield
 
 
+def _add_ml_routes(rsps, recommendation_body, prediction_body, status):
+    """Register the ML recommendation and prediction endpoints on rsps."""
+    for url, body in (
+        (ML_RECOMMENDATION_URL, recommendation_body),
+        (ML_PREDICTION_TODAY_URL, prediction_body),
+    ):
+        rsps.add(
+            responses.GET, url,
+            body=body, status=status, content_type='application/json'
+        )
+
+
+@pytest.fixture
+def ml_responses():
+    """Active responses.RequestsMock for the test; register ML endpoints with .add()."""
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        yield rsps
+
+
 @pytest.fixture
-def mock_ml_service_success(monkeypatch):
-    """Mock successful ML service responses."""
-    import responses
-
-    responses.add(
-        responses.GET,
-        'http://ml-service:5001/api/recommendation',
-        json={
-            'current_time': '10:00',
-            'recommended_preset': 'deep_work',
-            'reason': 'Morning hours are best for deep work',
-            'alternative': 'learning',
-            'confidence': 0.75
-        },
-        status=200
-    )
-
-    responses.add(
-        responses.GET,
-        'http://ml-service:5001/api/prediction/today',
-        json={
-            'date': '2025-12-28',
-            'predicted_sessions': 6,
-            'predicted_productivity': 4.0,
-            'confidence': 0.7
-        },
-        status=200
-    )
-
-    return responses
+def mock_ml_service_success(ml_responses):
+    """Mock successful ML service responses (active for the whole test)."""
+    _add_ml_routes(ml_responses, ML_RECOMMENDATION_BODY, ML_PREDICTION_TODAY_BODY, 200)
+    return ml_responses
 
 
 @pytest.fixture
-def mock_ml_service_unavailable(monkeypatch):
-    """Mock ML service unavailable."""
-    import responses
-
-    responses.add(
-        responses.GET,
-        'http://ml-service:5001/api/recommendation',
-        json={'error': 'Service unavailable'},
-        status=503
-    )
-
-    responses.add(
-        responses.GET,
-        'http://ml-service:5001/api/prediction/today',
-        json={'error': 'Service unavailable'},
-        status=503
-    )
-
-    return responses
+def mock_ml_service_unavailable(ml_responses):
+    """Mock ML service unavailable (active for the whole test)."""
+    _add_ml_routes(ml_responses, ML_UNAVAILABLE_BODY, ML_UNAVAILABLE_BODY, 503)
+    return ml_responses
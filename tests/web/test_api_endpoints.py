@@ -52,8 +52,7 @@ class TestConfigAPI:
 
         response = client.post(
             '/api/config',
-            data=json.dumps(update_data),
-            content_type='application/json'
+            json=update_data
         )
 
         assert response.status_code == 200
@@ -87,8 +86,7 @@ class TestSessionLogging:
 
             response = client.post(
                 '/api/log',
-                data=json.dumps(session_data),
-                content_type='application/json'
+                json=session_data
             )
 
             assert response.status_code == 200
@@ -115,8 +113,7 @@ class TestSessionLogging:
 
             response = client.post(
                 '/api/log',
-                data=json.dumps(session_data),
-                content_type='application/json'
+                json=session_data
             )
 
             assert response.status_code == 200
@@ -176,32 +173,17 @@ class TestStatisticsAPI:
 class TestMLIntegration:
     """Test ML service integration endpoints."""
 
-    @responses.activate
-    def test_ml_recommendation_success(self, client, mock_db):
+    def test_ml_recommendation_success(self, client, mock_db, mock_ml_service_success):
         """GET /api/recommendation should return ML recommendation."""
-        # Mock the ML service
-        responses.add(
-            responses.GET,
-            'http://ml-service:5001/api/recommendation',
-            json={
-                'current_time': '10:00',
-                'recommended_preset': 'deep_work',
-                'reason': 'Morning focus time',
-                'confidence': 0.75
-            },
-            status=200
-        )
-
         response = client.get('/api/recommendation')
 
         # Either success or graceful failure
         assert response.status_code in [200, 503]
 
-    @responses.activate
-    def test_ml_recommendation_failure(self, client, mock_db):
+    def test_ml_recommendation_failure(self, client, mock_db, ml_responses):
         """GET /api/recommendation should handle ML service failure."""
         # Mock ML service being unavailable
-        responses.add(
+        ml_responses.add(
             responses.GET,
             'http://ml-service:5001/api/recommendation',
             body=Exception('Connection refused')
@@ -212,20 +194,8 @@ class TestMLIntegration:
         # Should return 503 or handle gracefully
         assert response.status_code in [200, 500, 503]
 
-    @responses.activate
-    def test_ml_prediction_success(self, client, mock_db):
+    def test_ml_prediction_success(self, client, mock_db, mock_ml_service_success):
         """GET /api/prediction should return ML prediction."""
-        responses.add(
-            responses.GET,
-            'http://ml-service:5001/api/prediction/today',
-            json={
-                'predicted_sessions': 6,
-                'predicted_productivity': 4.0,
-                'confidence': 0.7
-            },
-            status=200
-        )
-
         response = client.get('/api/prediction')
 
         # Either success or graceful failure
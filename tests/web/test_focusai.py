@@ -4,187 +4,115 @@ Tests for database helper functions and API routes.
 """
 import pytest
 from datetime import datetime, date, timedelta
-from unittest.mock import MagicMock, patch
-import sys
-import os
 import json
 
-# Add web directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'web'))
-
 
 class TestGetRecentTasks:
     """Test get_recent_tasks() function."""
 
-    def test_get_recent_tasks_returns_list(self, app):
+    def test_get_recent_tasks_returns_list(self, db_module, mock_cursor):
         """get_recent_tasks() should return a list."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         mock_cursor.fetchall.return_value = []
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            result = db_module.get_recent_tasks()
-            assert isinstance(result, list)
+        result = db_module.get_recent_tasks()
+        assert isinstance(result, list)
 
-    def test_get_recent_tasks_empty_db(self, app):
+    def test_get_recent_tasks_empty_db(self, db_module, mock_cursor):
         """get_recent_tasks() should return empty list for empty DB."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         mock_cursor.fetchall.return_value = []
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            result = db_module.get_recent_tasks()
-            assert result == []
+        result = db_module.get_recent_tasks()
+        assert result == []
 
-    def test_get_recent_tasks_with_data(self, app):
+    def test_get_recent_tasks_with_data(self, db_module, mock_cursor):
         """get_recent_tasks() should return list of task names."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         # Function returns list of task names, not full dicts
         mock_cursor.fetchall.return_value = [
             {'task': 'React hooks'},
             {'task': 'Python async'},
         ]
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+        result = db_module.get_recent_tasks()
 
-            result = db_module.get_recent_tasks()
+        assert len(result) == 2
+        assert result[0] in ['React hooks', 'Python async']
+        assert isinstance(result[0], str)
 
-            assert len(result) == 2
-            assert result[0] in ['React hooks', 'Python async']
-            assert isinstance(result[0], str)
-
-    def test_get_recent_tasks_respects_limit(self, app):
+    def test_get_recent_tasks_respects_limit(self, db_module, mock_cursor):
         """get_recent_tasks(limit=N) should pass limit to SQL."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         mock_cursor.fetchall.return_value = []
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            db_module.get_recent_tasks(limit=5)
+        db_module.get_recent_tasks(limit=5)
 
-            call_args = mock_cursor.execute.call_args
-            assert 'LIMIT' in call_args[0][0]
+        call_args = mock_cursor.execute.call_args
+        assert 'LIMIT' in call_args[0][0]
 
 
 class TestGetCategoryDistribution:
     """Test get_category_distribution() function."""
 
-    def test_get_category_distribution_empty_db(self, app):
+    def test_get_category_distribution_empty_db(self, db_module, mock_cursor):
         """get_category_distribution() should return empty dict for empty DB."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         mock_cursor.fetchall.return_value = []
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            result = db_module.get_category_distribution()
-            assert result == {}
+        result = db_module.get_category_distribution()
+        assert result == {}
 
-    def test_get_category_distribution_structure(self, app):
+    def test_get_category_distribution_structure(self, db_module, mock_cursor):
         """get_category_distribution() should return {category: count} dict."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         # Function expects 'category' and 'count' keys
         mock_cursor.fetchall.return_value = [
             {'category': 'Coding', 'count': 5},
             {'category': 'Learning', 'count': 3},
         ]
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            result = db_module.get_category_distribution()
+        result = db_module.get_category_distribution()
 
-            assert 'Coding' in result
-            assert 'Learning' in result
-            assert result['Coding'] == 5
-            assert result['Learning'] == 3
+        assert 'Coding' in result
+        assert 'Learning' in result
+        assert result['Coding'] == 5
+        assert result['Learning'] == 3
 
 
 class TestGetHourlyProductivity:
     """Test get_hourly_productivity() function."""
 
-    def test_get_hourly_productivity_empty_db(self, app):
+    def test_get_hourly_productivity_empty_db(self, db_module, mock_cursor):
         """get_hourly_productivity() should return empty dict for empty DB."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         mock_cursor.fetchall.return_value = []
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+        result = db_module.get_hourly_productivity()
+        assert result == {}
 
-            result = db_module.get_hourly_productivity()
-            assert result == {}
-
-    def test_get_hourly_productivity_structure(self, app):
+    def test_get_hourly_productivity_structure(self, db_module, mock_cursor):
         """get_hourly_productivity() should return {hour: {sessions, avg_rating}} dict."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         # Function expects 'hour', 'sessions', and 'avg_rating' keys
         mock_cursor.fetchall.return_value = [
             {'hour': 9, 'sessions': 2, 'avg_rating': 85.0},
             {'hour': 10, 'sessions': 1, 'avg_rating': 70.0},
         ]
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+        result = db_module.get_hourly_productivity()
 
-            result = db_module.get_hourly_productivity()
-
-            assert 9 in result  # Integer key, not string
-            assert 10 in result
-            assert 'sessions' in result[9]
-            assert 'avg_rating' in result[9]
+        assert 9 in result  # Integer key, not string
+        assert 10 in result
+        assert 'sessions' in result[9]
+        assert 'avg_rating' in result[9]
 
 
 class TestGetSessionsLastNDays:
     """Test get_sessions_last_n_days() function."""
 
-    def test_get_sessions_last_n_days_empty(self, app):
+    def test_get_sessions_last_n_days_empty(self, db_module, mock_cursor):
         """get_sessions_last_n_days() should return empty list for empty DB."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         mock_cursor.fetchall.return_value = []
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            result = db_module.get_sessions_last_n_days()
-            assert result == []
+        result = db_module.get_sessions_last_n_days()
+        assert result == []
 
-    def test_get_sessions_last_n_days_returns_data(self, app):
+    def test_get_sessions_last_n_days_returns_data(self, db_module, mock_cursor):
         """get_sessions_last_n_days() should return sessions."""
-        import models.database as db_module
-
         today = date.today()
-        mock_cursor = MagicMock()
         # Function expects sessions with 'id' and serializable fields
         mock_cursor.fetchall.return_value = [
             {'id': 1, 'date': today, 'completed': True, 'task': 'Test',
@@ -192,152 +120,94 @@ class TestGetSessionsLastNDays:
              'productivity_rating': 4, 'hour': 9, 'day_of_week': 0},
         ]
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            result = db_module.get_sessions_last_n_days(days=30)
+        result = db_module.get_sessions_last_n_days(days=30)
 
-            assert len(result) == 1
+        assert len(result) == 1
 
 
 class TestCacheAIRecommendation:
     """Test AI cache functions."""
 
-    def test_cache_ai_recommendation_saves_data(self, app):
+    def test_cache_ai_recommendation_saves_data(self, db_module, mock_cursor):
         """cache_ai_recommendation() should save data to DB."""
-        import models.database as db_module
+        test_data = {'topic': 'React', 'reason': 'Popular framework'}
+        db_module.cache_ai_recommendation('learning', test_data, ttl_hours=24)
 
-        mock_cursor = MagicMock()
-
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            test_data = {'topic': 'React', 'reason': 'Popular framework'}
-            db_module.cache_ai_recommendation('learning', test_data, ttl_hours=24)
-
-            mock_cursor.execute.assert_called()
-            call_args = mock_cursor.execute.call_args
-            assert 'INSERT INTO ai_cache' in call_args[0][0]
+        mock_cursor.execute.assert_called()
+        call_args = mock_cursor.execute.call_args
+        assert 'INSERT INTO ai_cache' in call_args[0][0]
 
 
 class TestGetCachedAIRecommendation:
     """Test get_cached_ai_recommendation() function."""
 
-    def test_get_cached_ai_recommendation_returns_none_when_empty(self, app):
+    def test_get_cached_ai_recommendation_returns_none_when_empty(self, db_module, mock_cursor):
         """get_cached_ai_recommendation() should return None when no cache."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         mock_cursor.fetchone.return_value = None
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            result = db_module.get_cached_ai_recommendation('learning')
-            assert result is None
+        result = db_module.get_cached_ai_recommendation('learning')
+        assert result is None
 
-    def test_get_cached_ai_recommendation_returns_valid_cache(self, app):
+    def test_get_cached_ai_recommendation_returns_valid_cache(self, db_module, mock_cursor):
         """get_cached_ai_recommendation() should return valid cached data."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         # Function expects 'response' key, not 'data'
         mock_cursor.fetchone.return_value = {
             'response': {'topic': 'Python'},
             'expires_at': datetime.now() + timedelta(hours=24)
         }
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            result = db_module.get_cached_ai_recommendation('learning')
-            assert result == {'topic': 'Python'}
+        result = db_module.get_cached_ai_recommendation('learning')
+        assert result == {'topic': 'Python'}
 
 
 class TestInvalidateAICache:
     """Test invalidate_ai_cache() function."""
 
-    def test_invalidate_ai_cache_specific_type(self, app):
+    def test_invalidate_ai_cache_specific_type(self, db_module, mock_cursor):
         """invalidate_ai_cache() should soft-delete specific type via UPDATE."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
-
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            db_module.invalidate_ai_cache('learning')
+        db_module.invalidate_ai_cache('learning')
 
-            call_args = mock_cursor.execute.call_args
-            # Function uses UPDATE (soft delete), not DELETE
-            assert 'UPDATE ai_cache' in call_args[0][0]
-            assert 'learning' in call_args[0][1]
+        call_args = mock_cursor.execute.call_args
+        # Function uses UPDATE (soft delete), not DELETE
+        assert 'UPDATE ai_cache' in call_args[0][0]
+        assert 'learning' in call_args[0][1]
 
-    def test_invalidate_ai_cache_all(self, app):
+    def test_invalidate_ai_cache_all(self, db_module, mock_cursor):
         """invalidate_ai_cache() without arg should soft-delete all via UPDATE."""
-        import models.database as db_module
+        db_module.invalidate_ai_cache()
 
-        mock_cursor = MagicMock()
-
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            db_module.invalidate_ai_cache()
-
-            call_args = mock_cursor.execute.call_args
-            # Function uses UPDATE (soft delete), not DELETE
-            assert 'UPDATE ai_cache' in call_args[0][0]
+        call_args = mock_cursor.execute.call_args
+        # Function uses UPDATE (soft delete), not DELETE
+        assert 'UPDATE ai_cache' in call_args[0][0]
 
 
 class TestGetNearCompletionAchievements:
     """Test get_near_completion_achievements() function."""
 
-    def test_get_near_completion_achievements_empty(self, app):
+    def test_get_near_completion_achievements_empty(self, db_module, mock_cursor):
         """get_near_completion_achievements() should return empty list."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         mock_cursor.fetchall.return_value = []
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            result = db_module.get_near_completion_achievements()
-            assert result == []
+        result = db_module.get_near_completion_achievements()
+        assert result == []
 
 
 class TestGetLastSessionContext:
     """Test get_last_session_context() function."""
 
-    def test_get_last_session_context_empty_db(self, app):
+    def test_get_last_session_context_empty_db(self, db_module, mock_cursor):
         """get_last_session_context() should return empty dict for empty DB."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         mock_cursor.fetchone.return_value = None
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            result = db_module.get_last_session_context()
+        result = db_module.get_last_session_context()
 
-            # Returns empty dict when no sessions
-            assert result == {}
+        # Returns empty dict when no sessions
+        assert result == {}
 
-    def test_get_last_session_context_returns_last(self, app):
+    def test_get_last_session_context_returns_last(self, db_module, mock_cursor):
         """get_last_session_context() should return last session data."""
-        import models.database as db_module
         from datetime import date, time
 
-        mock_cursor = MagicMock()
         mock_cursor.fetchone.return_value = {
             'id': 1,
             'date': date.today(),
@@ -350,27 +220,20 @@ class TestGetLastSessionContext:
             'notes': ''
         }
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            result = db_module.get_last_session_context()
+        result = db_module.get_last_session_context()
 
-            assert result['category'] == 'Latest'
-            assert result['task'] == 'Latest task'
-            assert result['preset'] == 'deep_work'
-            assert result['productivity_rating'] == 90
-            assert '_id' in result
+        assert result['category'] == 'Latest'
+        assert result['task'] == 'Latest task'
+        assert result['preset'] == 'deep_work'
+        assert result['productivity_rating'] == 90
+        assert '_id' in result
 
 
 class TestGetUserAnalyticsForAI:
     """Test get_user_analytics_for_ai() function."""
 
-    def test_get_user_analytics_for_ai_structure(self, app):
+    def test_get_user_analytics_for_ai_structure(self, db_module, mock_cursor):
         """get_user_analytics_for_ai() should return all required fields."""
-        import models.database as db_module
-
-        mock_cursor = MagicMock()
         mock_cursor.fetchall.return_value = []
         # Return proper user_profile structure
         mock_cursor.fetchone.return_value = {
@@ -391,18 +254,14 @@ class TestGetUserAnalyticsForAI:
             'streak_start_date': None
         }
 
-        with patch.object(db_module, 'get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-            result = db_module.get_user_analytics_for_ai()
+        result = db_module.get_user_analytics_for_ai()
 
-            # Function returns weekly_stats, streak, profile, category_distribution, hourly_productivity
-            assert 'weekly_stats' in result
-            assert 'streak' in result
-            assert 'category_distribution' in result
-            assert 'hourly_productivity' in result
-            assert 'profile' in result
+        # Function returns weekly_stats, streak, profile, category_distribution, hourly_productivity
+        assert 'weekly_stats' in result
+        assert 'streak' in result
+        assert 'category_distribution' in result
+        assert 'hourly_productivity' in result
+        assert 'profile' in result
 
 
 # =============================================================================
@@ -452,8 +311,7 @@ class TestFocusAIEndpoints:
         """POST /api/ai/extract-topics should accept tasks."""
         response = client.post(
             '/api/ai/extract-topics',
-            data=json.dumps({'tasks': ['React hooks', 'Python async']}),
-            content_type='application/json'
+            json={'tasks': ['React hooks', 'Python async']}
         )
         # May fail if ML service unavailable, but endpoint should exist
         assert response.status_code in [200, 500, 503]
@@ -462,8 +320,7 @@ class TestFocusAIEndpoints:
         """POST /api/ai/analyze-patterns should accept data."""
         response = client.post(
             '/api/ai/analyze-patterns',
-            data=json.dumps({'sessions': []}),
-            content_type='application/json'
+            json={'sessions': []}
         )
         assert response.status_code in [200, 500, 503]
 
@@ -479,8 +336,7 @@ class TestFocusAIEndpoints:
         """POST /api/ai/invalidate-cache should accept type param."""
         response = client.post(
             '/api/ai/invalidate-cache',
-            data=json.dumps({'type': 'learning'}),
-            content_type='application/json'
+            json={'type': 'learning'}
         )
         assert response.status_code == 200
 
@@ -488,10 +344,9 @@ class TestFocusAIEndpoints:
 class TestFocusAIWithMockedMLService:
     """Test FocusAI endpoints with mocked ML service responses."""
 
-    @responses.activate
-    def test_ai_recommendations_from_ml_service(self, client):
+    def test_ai_recommendations_from_ml_service(self, client, ml_responses):
         """Should proxy to ML service when available."""
-        responses.add(
+        ml_responses.add(
             responses.POST,
             'http://ml-service:5001/api/ai/learning-recommendations',
             json={
@@ -506,10 +361,9 @@ class TestFocusAIWithMockedMLService:
         # Should have response
         assert response.status_code == 200
 
-    @responses.activate
-    def test_ai_fallback_when_ml_unavailable(self, client):
+    def test_ai_fallback_when_ml_unavailable(self, client, ml_responses):
         """Should use fallback when ML service unavailable."""
-        responses.add(
+        ml_responses.add(
             responses.POST,
             'http://ml-service:5001/api/ai/learning-recommendations',
             json={'error': 'Service unavailable'},
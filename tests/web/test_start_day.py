@@ -5,15 +5,10 @@ session planning, and daily challenge.
 """
 import pytest
 from datetime import datetime, date
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 import json
-import sys
-import os
 import responses
 
-# Add web directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'web'))
-
 
 class TestGetStartDayEndpoint:
     """Test GET /api/start-day endpoint."""
@@ -102,12 +97,11 @@ class TestPostStartDayEndpoint:
         """POST /api/start-day should save plan successfully."""
         response = client.post(
             '/api/start-day',
-            data=json.dumps({
+            json={
                 'themes': [{'theme': 'Coding', 'planned_sessions': 3}],
                 'notes': 'Focus on React today',
                 'challenge_accepted': False
-            }),
-            content_type='application/json'
+            }
         )
 
         assert response.status_code == 200
@@ -118,13 +112,12 @@ class TestPostStartDayEndpoint:
         """POST /api/start-day should return validated themes."""
         response = client.post(
             '/api/start-day',
-            data=json.dumps({
+            json={
                 'themes': [
                     {'theme': 'Coding', 'planned_sessions': 3},
                     {'theme': 'Learning', 'planned_sessions': 2}
                 ]
-            }),
-            content_type='application/json'
+            }
         )
 
         data = json.loads(response.data)
@@ -135,13 +128,12 @@ class TestPostStartDayEndpoint:
         """POST /api/start-day should return total planned sessions."""
         response = client.post(
             '/api/start-day',
-            data=json.dumps({
+            json={
                 'themes': [
                     {'theme': 'Coding', 'planned_sessions': 3},
                     {'theme': 'Learning', 'planned_sessions': 2}
                 ]
-            }),
-            content_type='application/json'
+            }
         )
 
         data = json.loads(response.data)
@@ -151,11 +143,10 @@ class TestPostStartDayEndpoint:
         """POST /api/start-day with challenge_accepted should track it."""
         response = client.post(
             '/api/start-day',
-            data=json.dumps({
+            json={
                 'themes': [{'theme': 'Coding', 'planned_sessions': 3}],
                 'challenge_accepted': True
-            }),
-            content_type='application/json'
+            }
         )
 
         data = json.loads(response.data)
@@ -178,8 +169,7 @@ class TestPostStartDayEndpoint:
         """POST /api/start-day with empty themes should succeed."""
         response = client.post(
             '/api/start-day',
-            data=json.dumps({'themes': [], 'notes': 'Rest day'}),
-            content_type='application/json'
+            json={'themes': [], 'notes': 'Rest day'}
         )
 
         assert response.status_code == 200
@@ -190,8 +180,7 @@ class TestPostStartDayEndpoint:
         """POST /api/start-day should return date."""
         response = client.post(
             '/api/start-day',
-            data=json.dumps({'themes': []}),
-            content_type='application/json'
+            json={'themes': []}
         )
 
         data = json.loads(response.data)
@@ -201,12 +190,11 @@ class TestPostStartDayEndpoint:
         """POST /api/start-day should clamp sessions to valid range."""
         response = client.post(
             '/api/start-day',
-            data=json.dumps({
+            json={
                 'themes': [
                     {'theme': 'Coding', 'planned_sessions': 100}  # Over max
                 ]
-            }),
-            content_type='application/json'
+            }
         )
 
         data = json.loads(response.data)
@@ -219,11 +207,10 @@ class TestPostStartDayEndpoint:
         long_notes = 'x' * 2000
         response = client.post(
             '/api/start-day',
-            data=json.dumps({
+            json={
                 'themes': [],
                 'notes': long_notes
-            }),
-            content_type='application/json'
+            }
         )
 
         data = json.loads(response.data)
@@ -239,12 +226,11 @@ class TestStartDayValidation:
         """Invalid categories should be filtered out."""
         response = client.post(
             '/api/start-day',
-            data=json.dumps({
+            json={
                 'themes': [
                     {'theme': 'INVALID_CATEGORY_XYZ', 'planned_sessions': 5}
                 ]
-            }),
-            content_type='application/json'
+            }
         )
 
         data = json.loads(response.data)
@@ -256,12 +242,11 @@ class TestStartDayValidation:
         """Negative session count should be clamped to 1."""
         response = client.post(
             '/api/start-day',
-            data=json.dumps({
+            json={
                 'themes': [
                     {'theme': 'Coding', 'planned_sessions': -5}
                 ]
-            }),
-            content_type='application/json'
+            }
         )
 
         data = json.loads(response.data)
@@ -272,10 +257,8 @@ class TestStartDayValidation:
 class TestStartDayIntegration:
     """Integration tests for Start Day workflow."""
 
-    def test_start_day_then_check_focus(self, client, app):
+    def test_start_day_then_check_focus(self, client, app, db_module):
         """After Start Day, daily focus should be set."""
-        import models.database as db_module
-
         with patch.object(db_module, 'set_daily_focus') as mock_set:
             mock_set.return_value = True
 
@@ -290,13 +273,12 @@ class TestStartDayIntegration:
                 # First, set the start day
                 client.post(
                     '/api/start-day',
-                    data=json.dumps({
+                    json={
                         'themes': [
                             {'theme': 'Coding', 'planned_sessions': 4}
                         ],
                         'notes': 'Integration test'
-                    }),
-                    content_type='application/json'
+                    }
                 )
 
                 # Then check today's focus
@@ -311,19 +293,17 @@ class TestStartDayIntegration:
         # First plan
         client.post(
             '/api/start-day',
-            data=json.dumps({
+            json={
                 'themes': [{'theme': 'Coding', 'planned_sessions': 2}]
-            }),
-            content_type='application/json'
+            }
         )
 
         # Second plan (update)
         response = client.post(
             '/api/start-day',
-            data=json.dumps({
+            json={
                 'themes': [{'theme': 'Learning', 'planned_sessions': 5}]
-            }),
-            content_type='application/json'
+            }
         )
 
         data = json.loads(response.data)
@@ -333,10 +313,9 @@ class TestStartDayIntegration:
 class TestStartDayWithMockedMLService:
     """Test Start Day with mocked ML service."""
 
-    @responses.activate
-    def test_start_day_with_ml_briefing(self, client):
+    def test_start_day_with_ml_briefing(self, client, ml_responses):
         """GET /api/start-day should include ML morning briefing when available."""
-        responses.add(
+        ml_responses.add(
             responses.GET,
             'http://ml-service:5001/api/ai/morning-briefing',
             json={
@@ -348,7 +327,7 @@ class TestStartDayWithMockedMLService:
         )
 
         # Also mock the categories sync
-        responses.add(
+        ml_responses.add(
             responses.POST,
             'http://ml-service:5001/api/config/categories',
             json={'status': 'ok'},
@@ -363,17 +342,16 @@ class TestStartDayWithMockedMLService:
         if data.get('morning_briefing'):
             assert 'analysis' in data['morning_briefing'] or 'recommendations' in data['morning_briefing']
 
-    @responses.activate
-    def test_start_day_handles_ml_failure(self, client):
+    def test_start_day_handles_ml_failure(self, client, ml_responses):
         """GET /api/start-day should handle ML service failure gracefully."""
-        responses.add(
+        ml_responses.add(
             responses.GET,
             'http://ml-service:5001/api/ai/morning-briefing',
             json={'error': 'Service unavailable'},
             status=503
         )
 
-        responses.add(
+        ml_responses.add(
             responses.POST,
             'http://ml-service:5001/api/config/categories',
             json={'status': 'ok'},
@@ -391,11 +369,10 @@ class TestStartDayWithMockedMLService:
 class TestSyncCategoriesToMLService:
     """Test category synchronization with ML service."""
 
-    @responses.activate
-    def test_categories_synced_on_start_day(self, client):
+    def test_categories_synced_on_start_day(self, client, ml_responses):
         """GET /api/start-day should sync categories to ML service."""
         # Mock the categories endpoint
-        responses.add(
+        ml_responses.add(
             responses.POST,
             'http://ml-service:5001/api/config/categories',
             json={'status': 'ok'},
@@ -403,7 +380,7 @@ class TestSyncCategoriesToMLService:
         )
 
         # Mock morning briefing
-        responses.add(
+        ml_responses.add(
             responses.GET,
             'http://ml-service:5001/api/ai/morning-briefing',
             json={'analysis': 'test'},
@@ -413,13 +390,12 @@ class TestSyncCategoriesToMLService:
         response = client.get('/api/start-day')
 
         # Categories endpoint should have been called
-        assert len([r for r in responses.calls if 'categories' in r.request.url]) >= 1
+        assert len([r for r in ml_responses.calls if 'categories' in r.request.url]) >= 1
 
-    @responses.activate
-    def test_start_day_continues_without_sync(self, client):
+    def test_start_day_continues_without_sync(self, client, ml_responses):
         """GET /api/start-day should work even if sync fails."""
         # Mock categories endpoint to fail
-        responses.add(
+        ml_responses.add(
             responses.POST,
             'http://ml-service:5001/api/config/categories',
             json={'error': 'Failed'},
@@ -448,11 +424,10 @@ class TestDailyChallengeIntegration:
         """POST /api/start-day should handle challenge acceptance."""
         response = client.post(
             '/api/start-day',
-            data=json.dumps({
+            json={
                 'themes': [],
                 'challenge_accepted': True
-            }),
-            content_type='application/json'
+            }
         )
 
         data = json.loads(response.data)
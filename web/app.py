@@ -832,6 +832,7 @@ def api_anomalies():
         'anomalies_detected': 0,
         'overall_status': 'error',
         'anomalies': [],
+        'anomalies_by_type': {},
         'proactive_tips': [],
         'baseline_summary': None,
         'patterns': None,